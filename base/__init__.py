@@ -1,5 +1,5 @@
 from base.asserts import Asserts, AssertType
-from base.driver import Driver, SessionManager
+from base.driver import Driver, DriverPool, SessionManager
 from base.element import Element, Page
 from base.locator import Locator
 from base.webdriver import WebDriver as Chrome
@@ -0,0 +1,48 @@
+from typing import Callable, List
+
+from selenium.webdriver import ActionChains
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from base.browser_state import BrowserState
+from common import LogUtils
+
+
+class ActionBatch:
+    """
+    批量操作
+    收集多个元素上的点击、键盘输入、鼠标移动，执行时通过一次W3C Actions调用（POST /actions）发送，
+    每一步的日志在执行成功后按顺序输出。由Locator.batch()创建。
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._actions = ActionChains(driver)
+        self._steps: List[str] = []
+
+    def add(self, step: str, build: Callable[[ActionChains], ActionChains]):
+        """
+        加入一步操作
+        :param step: 该步的日志
+        :param build: 向ActionChains中加入操作的方法
+        """
+        build(self._actions)
+        self._steps.append(step)
+
+    def perform(self):
+        """
+        执行已加入的操作，执行后清空队列
+        """
+        if not self._steps:
+            return
+        actions, steps = self._actions, self._steps
+        self._actions, self._steps = ActionChains(self.driver), []
+        try:
+            actions.perform()
+        except Exception as e:
+            error_log = f'批量操作失败！{steps} {e}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+        BrowserState.of(self.driver).dom_changed()
+        for step in steps:
+            LogUtils().debug(step)
+        LogUtils().debug(f'批量操作完成，共{len(steps)}步！')
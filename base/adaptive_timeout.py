@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from base.element import Element
+from common import Config, LogUtils, singleton
+
+
+@singleton
+class TimeoutHistory:
+    """
+    元素定位耗时历史
+    记录每个元素（按定位路径）成功定位的耗时，据此计算该元素的定位超时和轮询间隔：
+        超时 = p99 * 1.5 + timeout_margin，限制在[timeout_floor, timeout_ceiling]之间
+        轮询间隔 = p50 / 4，限制在[0.05, 0.5]之间
+    样本不足min_samples时使用默认超时；yaml中配置了timeout的元素直接使用配置值。
+    配置：config.ini [locator]，历史文件：data/timing/locator_history.json
+    """
+    max_samples = 50
+    min_samples = 5
+    default_poll = 0.5
+
+    def __init__(self):
+        self.history_path = Path(os.getenv('HOME')) / 'data' / 'timing' / 'locator_history.json'
+        self.enabled = Config.getini('locator', 'adaptive_timeout', bool)
+        self.floor = Config.getini('locator', 'timeout_floor', float)
+        self.ceiling = Config.getini('locator', 'timeout_ceiling', float)
+        self.margin = Config.getini('locator', 'timeout_margin', float)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, dict] = self._read()
+        # 本进程新增的样本，保存时与磁盘上的历史合并
+        self._new_samples: Dict[str, List[float]] = defaultdict(list)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.history_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _quantile(samples: List[float], q: float) -> float:
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def record(self, element: Element, duration: float):
+        """
+        记录一次成功定位的耗时
+        :param element: 元素
+        :param duration: 耗时（秒）
+        """
+        with self._lock:
+            entry = self._samples.setdefault(element.path, {'name': element.chain_name, 'samples': []})
+            entry['samples'] = (entry['samples'] + [round(duration, 4)])[-self.max_samples:]
+            self._new_samples[element.path].append(round(duration, 4))
+
+    def settings(self, element: Element, default_timeout: float) -> Tuple[float, float]:
+        """
+        获取元素的定位超时和轮询间隔
+        :param element: 元素
+        :param default_timeout: 默认超时（秒）
+        :return: (超时, 轮询间隔)
+        """
+        if element.timeout:
+            return float(element.timeout), self.default_poll
+        entry = self._samples.get(element.path)
+        if not self.enabled or not entry or len(entry['samples']) < self.min_samples:
+            return default_timeout, self.default_poll
+        samples = entry['samples']
+        timeout = min(max(self._quantile(samples, 0.99) * 1.5 + self.margin, self.floor), self.ceiling)
+        poll = min(max(self._quantile(samples, 0.5) / 4, 0.05), self.default_poll)
+        return timeout, poll
+
+    def save(self):
+        """
+        将本进程新增的样本合并写入历史文件
+        """
+        if not self._new_samples:
+            return
+        try:
+            with self._lock:
+                data = self._read()
+                for path, samples in self._new_samples.items():
+                    entry = data.setdefault(path, {'name': self._samples[path]['name'], 'samples': []})
+                    entry['samples'] = (entry['samples'] + samples)[-self.max_samples:]
+                self.history_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.history_path.with_name(f'{self.history_path.name}.{os.getpid()}.tmp')
+                tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+                os.replace(tmp_path, self.history_path)
+                self._new_samples.clear()
+            LogUtils().debug(f'元素定位耗时历史已保存：{self.history_path}')
+        except Exception as e:
+            LogUtils().errors(f'元素定位耗时历史保存失败！{e}')
@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from base.element_cache import ElementCache
+from common import LogUtils
+
+
+class BrowserState:
+    """
+    浏览器状态跟踪，每个驱动一份
+    记录Locator跳转到的页面URL、当前所在的Frame路径和已定位元素缓存（页面跳转和页面内操作后清空），
+    目标页面、Frame已是当前状态时goto、switch_frame无需重新加载或切换。
+    """
+    # 各驱动的状态：{driver的session_id: BrowserState}
+    _states: Dict[str, 'BrowserState'] = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        # 最近一次通过goto跳转的URL，未跳转或跳转到其他页面后为None
+        self.url: Optional[str] = None
+        # 当前所在的Frame路径，顶层文档为空
+        self.frame_path: Tuple[str, ...] = ()
+        self.elements = ElementCache()
+
+    @classmethod
+    def of(cls, driver: WebDriver) -> 'BrowserState':
+        """
+        获取驱动的状态
+        """
+        with cls._lock:
+            if driver.session_id not in cls._states:
+                cls._states[driver.session_id] = cls()
+            return cls._states[driver.session_id]
+
+    def navigate(self, url: Optional[str]):
+        """
+        页面跳转：清空元素缓存，回到顶层文档
+        :param url: 跳转的URL，非Locator跳转（如about:blank）时为None
+        """
+        self.url = url
+        self.frame_path = ()
+        self.elements.clear()
+
+    def dom_changed(self):
+        """
+        页面内操作（点击、输入、悬停等）后DOM可能重新渲染，绝对路径、带序号的XPath可能定位到另一个节点，清空元素缓存
+        """
+        self.elements.clear()
+
+    def enter_frame(self, frame: str):
+        """
+        切换到子Frame，元素缓存按Frame路径区分，无需清空
+        :param frame: Frame元素路径
+        """
+        self.frame_path += (frame,)
+
+    def exit_frames(self):
+        """
+        回到顶层文档
+        """
+        self.frame_path = ()
+
+    def in_frame(self, frame: str) -> bool:
+        """
+        当前是否位于该Frame内
+        """
+        return bool(self.frame_path) and self.frame_path[-1] == frame
+
+    @classmethod
+    def report(cls):
+        """
+        输出各驱动的元素缓存命中统计
+        """
+        for session_id, state in cls._states.items():
+            cache = state.elements
+            total = cache.hits + cache.misses
+            if total:
+                LogUtils().debug(f'元素缓存[{session_id}]：命中{cache.hits}次，未命中{cache.misses}次，命中率{cache.hits / total:.1%}')
@@ -1,10 +1,85 @@
+import atexit
+import json
 import os
 import pickle
+import threading
+import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from queue import Queue, Empty
+from typing import Optional, Dict, Callable
 
+from base.browser_state import BrowserState
 from base.webdriver import WebDriver as Chrome, WebDriver
-from common import singleton, LogUtils
+from common import singleton, release_driver, LogUtils, Config, PublicData
+
+# 驱动窗口起始位置与大小，Driver和DriverPool共用
+WINDOW_POSITION = (-8, 0)
+WINDOW_SIZE = (1920, 1080)
+
+
+def init_window(driver: WebDriver):
+    """
+    设置驱动窗口的起始位置和大小
+    :param driver: 驱动
+    """
+    driver.set_window_position(*WINDOW_POSITION, windowHandle='current')
+    driver.set_window_size(*WINDOW_SIZE, windowHandle='current')
+
+
+def launch_driver(profile: str = None) -> WebDriver:
+    """
+    启动浏览器和驱动，并设置窗口
+    :param profile: 启动配置名称，为空时使用环境变量LAUNCH_PROFILE
+    :return: 驱动
+    """
+    driver = Chrome(profile=profile)
+    init_window(driver)
+    return driver
+
+
+# 后台启动驱动的future，由start_driver_async创建，Driver首次创建时取走
+_startup_future: Optional[Future] = None
+
+
+def start_driver_async() -> Future:
+    """
+    在后台线程启动浏览器和驱动，使冷启动与pytest收集、测试数据加载并行，
+    Driver()首次创建时只需等待该future完成
+    :return: 启动驱动的future
+    """
+    global _startup_future
+    if _startup_future is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-startup')
+        _startup_future = executor.submit(launch_driver)
+        executor.shutdown(wait=False)
+        atexit.register(_quit_unused_driver)
+        LogUtils().debug('驱动开始后台启动')
+    return _startup_future
+
+
+def _take_started_driver() -> WebDriver:
+    """
+    取走后台启动的驱动，未开启后台启动时直接同步启动
+    """
+    global _startup_future
+    future, _startup_future = _startup_future, None
+    if future is None:
+        return launch_driver()
+    start = time.perf_counter()
+    driver = future.result()
+    LogUtils().debug(f'等待后台驱动启动耗时：{time.perf_counter() - start:.3f}s')
+    return driver
+
+
+def _quit_unused_driver():
+    """
+    进程退出时关闭未被使用的后台驱动
+    """
+    if _startup_future is not None and _startup_future.done() and not _startup_future.exception():
+        _startup_future.result().quit()
 
 
 @singleton
@@ -13,18 +88,15 @@ class Driver:
     驱动类
     description: 由于Selenium的驱动启动过程比较耗时，因此这里使用单例模式，避免每次都要启动驱动,
                  同时Selenium升级到4.26.1后，会自动获取最新驱动，无需手动更新，在此不使用本地chrome_driver_update包
-                 首次启动时间较长，请耐心等待。
+                 首次启动时间较长，请耐心等待。pytest运行时会在pytest_configure阶段通过start_driver_async后台预启动。
                  驱动环境配置文件：env/se-config.env
     """
 
     def __init__(self):
         try:
-            self.driver = Chrome()
+            # 若已在后台启动驱动，则等待其完成
+            self.driver = _take_started_driver()
             driver_path = self.driver.service.path
-            # 驱动启动起始位置
-            self.driver.set_window_position(-8, 0, windowHandle='current')
-            # 驱动启动起始大小
-            self.driver.set_window_size(1920, 1080, windowHandle='current')
             # 实例化session管理器
             self.sessionManger = SessionManager(self.driver)
             debug_log = f'驱动路径：{driver_path}！  Driver first created!'
@@ -48,57 +120,353 @@ class Driver:
             raise Exception(error_log)
 
 
+@singleton
+class DriverPool:
+    """
+    驱动池
+    description: 预先启动多个浏览器会话，按测试（或测试类）租借，归还时重置会话状态后放回池中，
+                 租借到的驱动可通过Locator(driver=...)或页面对象的driver参数绑定使用。
+                 池大小配置：config/config.ini [driver] pool_size
+                 启动配置：profile参数或环境变量LAUNCH_PROFILE，见config/launch_profile.yaml
+    """
+
+    def __init__(self, size: int = None, profile: str = None):
+        self.size = size or Config.getini('driver', 'pool_size', int)
+        self.profile = profile
+        self._idle: Queue = Queue()
+        self._drivers = []
+        self._session_managers = {}
+        self._lock = threading.Lock()
+        try:
+            # 并行启动浏览器，启动耗时取决于最慢的一个而不是总和
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                for driver in executor.map(lambda _: self._create_driver(), range(self.size)):
+                    self._idle.put(driver)
+            debug_log = f'驱动池启动完成，共{self.size}个驱动！'
+            LogUtils().debug(debug_log)
+        except Exception as e:
+            self.close()
+            error_log = f'驱动池启动失败！{e} {traceback.format_exc()}'
+            LogUtils().logs("error", "debug", msg=error_log)
+            raise RuntimeError(error_log)
+        atexit.register(self.close)
+
+    def _create_driver(self) -> WebDriver:
+        """
+        启动一个新的驱动并加入池中
+        """
+        driver = launch_driver(self.profile)
+        with self._lock:
+            self._drivers.append(driver)
+            self._session_managers[driver] = SessionManager(driver)
+        LogUtils().debug(f'驱动池新增驱动：{driver.session_id}')
+        return driver
+
+    def _discard_driver(self, driver: WebDriver):
+        """
+        关闭并移出无法复用的驱动
+        """
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._session_managers.pop(driver, None)
+        # 释放绑定该驱动的页面对象
+        release_driver(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            LogUtils().errors(f'驱动池关闭驱动失败：{e}')
+
+    def lease(self, timeout: float = None) -> WebDriver:
+        """
+        租借一个空闲驱动，池中无空闲驱动时阻塞等待
+        :param timeout: 等待超时时间（秒），为空则一直等待
+        :return: 驱动
+        """
+        try:
+            driver = self._idle.get(timeout=timeout)
+        except Empty:
+            error_log = f'驱动池租借超时！{timeout}秒内无空闲驱动'
+            LogUtils().errors(error_log)
+            raise TimeoutError(error_log)
+        LogUtils().debug(f'驱动租借：{driver.session_id}')
+        return driver
+
+    def release(self, driver: WebDriver):
+        """
+        归还驱动，重置会话状态后放回池中；重置失败时替换为新驱动
+        :param driver: 驱动
+        """
+        try:
+            self.reset(driver)
+            self._idle.put(driver)
+            LogUtils().debug(f'驱动归还：{driver.session_id}')
+        except Exception as e:
+            LogUtils().errors(f'驱动重置失败，替换为新驱动：{e}')
+            self._discard_driver(driver)
+            self._idle.put(self._create_driver())
+
+    @contextmanager
+    def leased(self, timeout: float = None):
+        """
+        以上下文方式租借驱动，退出时自动归还
+        """
+        driver = self.lease(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def session_manager(self, driver: WebDriver) -> 'SessionManager':
+        """
+        获取池中驱动对应的session管理器
+        """
+        return self._session_managers[driver]
+
+    # 重置时清除的存储类型，sessionStorage随标签页一起丢弃
+    _storage_types = 'local_storage,indexeddb,cache_storage,service_workers,file_systems,websql'
+
+    def reset(self, driver: WebDriver):
+        """
+        重置驱动会话：清除session管理器状态，换用新标签页（丢弃各源的sessionStorage）并关闭其余窗口，通过CDP清除全部源的Cookies，
+        清除平台源和归还前所在源的本地存储，恢复窗口大小。
+        delete_all_cookies()、localStorage.clear()只作用于当前文档的源，归还前停留在其他页面或about:blank时清不干净
+        :param driver: 驱动
+        """
+        # 先在原标签页上清除session：移除本地存储恢复脚本和已加载记录，否则下一个租借者会被注入上一个session的本地存储
+        self.session_manager(driver).delete_session()
+        origins = {f"http://{PublicData.get_constant_data()['spgz_ip']}"}
+        try:
+            origins.add(driver.execute_script("return location.origin"))
+        except Exception as e:
+            LogUtils().debug(f'获取当前源跳过：{e}')
+        old_handles = driver.window_handles
+        driver.switch_to.new_window('tab')
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for origin in origins:
+            if origin.startswith('http'):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': self._storage_types})
+        BrowserState.of(driver).navigate(None)
+        init_window(driver)
+
+    def close(self):
+        """
+        关闭池中所有驱动
+        """
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._discard_driver(driver)
+        LogUtils().debug('驱动池已关闭')
+
+
 class SessionManager:
+    """
+    session管理器
+    保存时记录Cookies以及当前源的localStorage、sessionStorage，
+    恢复时通过一次CDP Network.setCookies写入全部Cookies，本地存储在下次进入该源的页面时由预置脚本写入，全程无需页面跳转
+    session文件解析结果在进程内按修改时间缓存，ensure_session只在浏览器未登录或Cookies过期时才重新注入或重新登录
+    """
+    # 进程内session文件缓存：{文件路径: (修改时间, session)}
+    _file_cache: Dict[Path, tuple] = {}
+    # 采集当前源的本地存储
+    _capture_storage_js = """
+        const dump = (storage) => Object.fromEntries(Object.keys(storage).map(k => [k, storage.getItem(k)]));
+        return {origin: location.origin, local_storage: dump(localStorage), session_storage: dump(sessionStorage)};
+    """
+    # 进入指定源的页面时恢复本地存储，每个标签页只恢复一次，避免覆盖测试过程中产生的数据
+    _restore_storage_js = """
+        (function (session) {
+            if (location.origin !== session.origin || sessionStorage.getItem('__session_restored__')) return;
+            for (const [k, v] of Object.entries(session.local_storage)) localStorage.setItem(k, v);
+            for (const [k, v] of Object.entries(session.session_storage)) sessionStorage.setItem(k, v);
+            sessionStorage.setItem('__session_restored__', '1');
+        })(%s);
+    """
 
     def __init__(self, driver: WebDriver):
         self.session_path = Path(os.getenv('HOME')) / 'data' / 'session'
         self.session_path.mkdir(parents=True, exist_ok=True)
         self.driver = driver
+        # 恢复本地存储的预置脚本标识
+        self._storage_script_id = None
+        # 已加载到当前浏览器的session：{session_name: session}
+        self._loaded: Dict[str, dict] = {}
 
     def save_session(self, session_name):
         """
-        保存当前会话的Cookies
+        保存当前会话的Cookies和本地存储
         """
         try:
-            cookies = self.driver.get_cookies()
+            session = {'cookies': self.driver.get_cookies()}
+            try:
+                session.update(self.driver.execute_script(self._capture_storage_js))
+            except Exception as e:
+                # about:blank等页面没有可访问的本地存储
+                LogUtils().debug(f'本地存储采集跳过：{e}')
             cookies_path = self.session_path / f'{session_name}_cookies.pkl'
-            cookies_path.write_bytes(pickle.dumps(cookies))
-            LogUtils().debug(f'Session saved as {session_name}_cookies.pkl,cookies:{cookies}')
+            cookies_path.write_bytes(pickle.dumps(session))
+            self._loaded[session_name] = session
+            LogUtils().debug(f'Session saved as {session_name}_cookies.pkl,session:{session}')
         except Exception as e:
             LogUtils().errors(f'Failed to save session: {e}')
 
+    @staticmethod
+    def _to_cdp_cookie(cookie: dict) -> dict:
+        """
+        将Selenium格式的Cookie转换为CDP Network.CookieParam格式
+        """
+        cdp_cookie = {
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'domain': cookie.get('domain'),
+            'path': cookie.get('path', '/'),
+            'secure': cookie.get('secure', False),
+            'httpOnly': cookie.get('httpOnly', False),
+        }
+        if cookie.get('sameSite'):
+            cdp_cookie['sameSite'] = cookie['sameSite']
+        if cookie.get('expiry'):
+            cdp_cookie['expires'] = cookie['expiry']
+        return cdp_cookie
+
     def load_session(self, session_name):
         """
-        从保存的Cookies中恢复会话
+        从保存的Cookies和本地存储中恢复会话，不进行页面跳转
         """
         cookies_path = self.session_path / f'{session_name}_cookies.pkl'
         try:
-            with open(cookies_path, 'rb') as file:
-                cookies = pickle.load(file)
-                for cookie in cookies:
-                    try:
-                        domain = cookie.get('domain')
-                        if domain not in self.driver.current_url:
-                            protocol = 'https' if 'https' in self.driver.current_url else 'http'
-                            # 加载cookie之前先访问对应域名，否则可能导致cookie失效
-                            self.driver.get(f'{protocol}://{domain}')
-                        self.driver.add_cookie(cookie)
-                        LogUtils().debug(f'Cookie added:{cookie}')
-                    except Exception as e:
-                        LogUtils().errors(f'Failed to add cookie:{cookie} {e}')
-            LogUtils().debug(f'Session loaded from {session_name}_cookies.pkl')
+            start = time.perf_counter()
+            session = self._read_session(session_name)
+            cookies = [self._to_cdp_cookie(cookie) for cookie in session['cookies']]
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+            LogUtils().debug(f'Cookies added:{cookies}')
+            if session.get('origin'):
+                self._restore_storage(session)
+            self._loaded[session_name] = session
+            LogUtils().debug(f'Session loaded from {session_name}_cookies.pkl, 耗时：{time.perf_counter() - start:.3f}s')
         except Exception as e:
             LogUtils().errors(f'Failed to load session_file:{cookies_path} {e}')
 
+    def _read_session(self, session_name) -> dict:
+        """
+        读取session文件，文件未修改时直接使用进程内缓存
+        """
+        cookies_path = self.session_path / f'{session_name}_cookies.pkl'
+        mtime = cookies_path.stat().st_mtime
+        cached = self._file_cache.get(cookies_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(cookies_path, 'rb') as file:
+            session = pickle.load(file)
+        # 兼容旧格式：只保存了Cookies列表
+        if isinstance(session, list):
+            session = {'cookies': session}
+        self._file_cache[cookies_path] = (mtime, session)
+        return session
+
+    @staticmethod
+    def is_expired(session: dict) -> bool:
+        """
+        判断session中是否有已过期的持久Cookie（无expiry的会话Cookie不按时间过期）
+        """
+        now = time.time()
+        return any(cookie.get('expiry') and cookie['expiry'] <= now for cookie in session['cookies'])
+
+    def is_authenticated(self, session_name) -> bool:
+        """
+        低成本判断浏览器是否仍处于该session的登录状态：
+        配置了[session] probe_api且当前页面与session同源时请求该接口，否则通过CDP检查浏览器中该源是否存在同名Cookies
+        """
+        session = self._loaded.get(session_name)
+        if not session or self.is_expired(session):
+            return False
+        probe_api = Config.getini('session', 'probe_api')
+        if probe_api and session.get('origin') and self.driver.current_url.startswith(session['origin']):
+            status = self.driver.execute_async_script(
+                "const done = arguments[arguments.length - 1];"
+                "fetch(arguments[0], {credentials: 'include'}).then(r => done(r.status), () => done(0));",
+                probe_api
+            )
+            return status == 200
+        # get_cookies()只返回当前文档的Cookies，在about:blank或其他源上总是失败；CDP按session的源查询，与当前页面无关
+        if session.get('origin'):
+            urls = [session['origin']]
+        else:
+            urls = [f"{'https' if c.get('secure') else 'http'}://{c['domain'].lstrip('.')}{c.get('path', '/')}"
+                    for c in session['cookies'] if c.get('domain')]
+        browser_cookies = {cookie['name'] for cookie in self.driver.execute_cdp_cmd('Network.getCookies', {'urls': urls})['cookies']}
+        return all(cookie['name'] in browser_cookies for cookie in session['cookies'])
+
+    def ensure_session(self, session_name, relogin: Callable = None) -> bool:
+        """
+        确保浏览器处于该session的登录状态，只在需要时重新注入Cookies或重新登录
+        :param session_name: session名称
+        :param relogin: 重新登录的方法，session文件不存在或已过期时调用，登录后自动保存session
+        :return: 是否处于登录状态
+        """
+        try:
+            if self.is_authenticated(session_name):
+                LogUtils().debug(f'Session {session_name} 仍然有效，跳过加载')
+                return True
+            self._loaded.pop(session_name, None)
+            try:
+                session = self._read_session(session_name)
+            except FileNotFoundError:
+                session = None
+            if session and not self.is_expired(session):
+                self.load_session(session_name)
+                return True
+            if relogin:
+                LogUtils().debug(f'Session {session_name} 不存在或已过期，重新登录')
+                relogin()
+                self.save_session(session_name)
+                return True
+            LogUtils().errors(f'Session {session_name} 不存在或已过期，请重新执行登录用例')
+            return False
+        except Exception as e:
+            LogUtils().errors(f'Failed to ensure session:{session_name} {e}')
+            return False
+
+    def _restore_storage(self, session: dict):
+        """
+        预置恢复本地存储的脚本，当前页面已是该源时立即恢复
+        """
+        storage = {k: session.get(k) or {} for k in ('origin', 'local_storage', 'session_storage')}
+        source = self._restore_storage_js % json.dumps(storage)
+        self._remove_storage_script()
+        result = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+        self._storage_script_id = result['identifier']
+        self.driver.execute_script(source)
+        LogUtils().debug(f'本地存储恢复脚本已预置：{storage["origin"]}')
+
+    def _remove_storage_script(self):
+        """
+        移除恢复本地存储的预置脚本
+        """
+        if self._storage_script_id:
+            self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self._storage_script_id})
+            self._storage_script_id = None
+
     def delete_session(self):
         """
         清除当前会话的Cookies、缓存
         """
         try:
+            self._loaded.clear()
+            # 移除恢复本地存储的预置脚本，否则下次进入该源时仍会写入旧session的本地存储
+            self._remove_storage_script()
             self.driver.delete_all_cookies()
             # 清理cookie后，还需要清理浏览器本地数据
-            self.driver.execute_script("localStorage.clear();")
-            self.driver.execute_script("sessionStorage.clear();")
+            try:
+                self.driver.execute_script("localStorage.clear();sessionStorage.clear();")
+            except Exception as e:
+                # about:blank等页面没有可访问的本地存储
+                LogUtils().debug(f'本地存储清理跳过：{e}')
             LogUtils().debug('Session cookies deleted')
         except Exception as e:
             LogUtils().errors(f'Failed to delete session cookies: {e}')
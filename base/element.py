@@ -1,8 +1,13 @@
-import inspect
+import hashlib
+import importlib
+import json
 import os
+import sys
+import threading
 from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
 
-from ruamel.yaml import YAML, CommentedMap
+from ruamel.yaml import YAML
 from selenium.webdriver.common.by import By
 
 from common import LogUtils
@@ -10,49 +15,214 @@ from common import LogUtils
 
 class Element:
     """
-    元素对象，包含元素定位方式和定位路径。
+    元素对象，包含元素定位方式和定位路径，创建后不可修改。
+    chain_name为元素在yaml中的链式路径，timeout为yaml中配置的定位超时（秒），配置后不再使用自适应超时。
+    input_mode为输入方式：keys逐键输入（默认），script通过脚本直接设置值并触发input/change事件，适用于长文本。
+    yaml中元素的子元素为元素子类的类属性，子元素名不能与以上字段重名。
     """
-    __method_set = {'css', 'xpath'}
+    __slots__ = ('method', 'path', 'chain_name', 'timeout', 'input_mode')
+    __method_set = {'css', 'xpath', By.CSS_SELECTOR}
     __method_map = {
         'css': By.CSS_SELECTOR,
-        'xpath': By.XPATH
+        'xpath': By.XPATH,
+        # 兼容直接传入By定位方式，如load_elements根据已有元素生成新元素
+        By.CSS_SELECTOR: By.CSS_SELECTOR
     }
+    __input_modes = {'keys', 'script'}
 
-    def __init__(self, method: str, path: str):
+    def __init__(self, method: str, path: str, chain_name: str = None, timeout: float = None, input_mode: str = None):
+        if input_mode and input_mode not in self.__input_modes:
+            error_log = f'input_mode {input_mode} not support! '
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
         if method in self.__method_set:
-            self.method = self.__method_map.get(method)
-            self.path = path
+            object.__setattr__(self, 'method', self.__method_map.get(method))
+            object.__setattr__(self, 'path', path)
+            object.__setattr__(self, 'chain_name', chain_name or path)
+            object.__setattr__(self, 'timeout', timeout)
+            object.__setattr__(self, 'input_mode', input_mode or 'keys')
         else:
             error_log = f'{method} not support! '
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
+    def __setattr__(self, key, value):
+        raise AttributeError(f'元素{self.chain_name}不可修改: {key}')
+
+    def __repr__(self):
+        return f'<Element {self.chain_name}: {self.method}={self.path}>'
+
+
+class _FrozenNamespace(type):
+    """
+    页面模块命名空间的元类，禁止修改类属性
+    """
+
+    def __setattr__(cls, key, value):
+        raise AttributeError(f'页面模块{cls.__qualname__}不可修改: {key}')
+
+    def __repr__(cls):
+        return f'<PageNamespace {cls.__qualname__}>'
+
+
+class PageNamespace(metaclass=_FrozenNamespace):
+    """
+    页面模块命名空间，模块下的元素、子模块为类属性，在所有页面对象间共享，不可修改
+    """
+    __slots__ = ()
+
+
+class PageRegistry:
+    """
+    进程级页面元素注册表
+    每个yaml文件只解析一次，解析结果（元素数据）按文件修改时间、大小和sha1持久化到data/compiled/pages，
+    文件未变化时直接读取json，不再经过yaml解析；构建出的元素树在进程内共享。
+    page_object/generated下存在与yaml内容一致的生成模块（见base.page_codegen）时直接使用生成模块中的元素树。
+    """
+    _pages: Dict[Path, Tuple[tuple, dict, type]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _compiled_path(yaml_path: Path) -> Path:
+        return Path(os.getenv('HOME')) / 'data' / 'compiled' / 'pages' / f'{yaml_path.stem}.json'
+
+    @classmethod
+    def get(cls, yaml_path: Path) -> Tuple[dict, type]:
+        """
+        获取yaml文件的元素数据和元素树
+        :param yaml_path: yaml文件路径
+        :return: (元素数据, 元素树)
+        """
+        stat = yaml_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            cached = cls._pages.get(yaml_path)
+            if cached and cached[0] == signature:
+                return cached[1], cached[2]
+            data, sha1 = cls._compile(yaml_path, signature)
+            if not data:
+                error_log = f"元素文件为空: {yaml_path}"
+                LogUtils().errors(error_log)
+                raise Exception(error_log)
+            tree = cls._generated(yaml_path, sha1) or cls._build(data)
+            cls._pages[yaml_path] = (signature, data, tree)
+            return data, tree
+
+    @classmethod
+    def _compile(cls, yaml_path: Path, signature: tuple) -> Tuple[dict, str]:
+        """
+        读取已编译的元素数据，yaml文件变化时重新解析并写入
+        :return: (元素数据, yaml文件sha1)
+        """
+        compiled_path = cls._compiled_path(yaml_path)
+        try:
+            compiled = json.loads(compiled_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            compiled = {}
+        if compiled.get('signature') == list(signature):
+            return compiled['data'], compiled['sha1']
+        content = yaml_path.read_bytes()
+        sha1 = hashlib.sha1(content).hexdigest()
+        # 只有修改时间变化（如重新检出）时内容哈希不变，沿用编译结果
+        if compiled.get('sha1') == sha1:
+            data = compiled['data']
+        else:
+            data = YAML(typ='safe').load(content)
+            LogUtils().debug(f'元素文件已编译: {yaml_path}')
+        try:
+            compiled_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = compiled_path.with_name(f'{compiled_path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps({'signature': list(signature), 'sha1': sha1, 'data': data}, ensure_ascii=False),
+                                encoding='utf-8')
+            os.replace(tmp_path, compiled_path)
+        except OSError as e:
+            LogUtils().errors(f'元素编译结果保存失败: {compiled_path} {e}')
+        return data, sha1
+
+    @staticmethod
+    def _generated(yaml_path: Path, sha1: str) -> Optional[type]:
+        """
+        获取生成模块中的元素树，模块不存在或已过期（yaml内容变化）时返回None
+        """
+        try:
+            module = importlib.import_module(f'page_object.generated.{yaml_path.stem}')
+        except ImportError:
+            return None
+        if module.SOURCE_SHA1 != sha1:
+            LogUtils().debug(f'生成的页面模块已过期: {module.__name__}，请执行python -m base.page_codegen重新生成')
+            return None
+        return module.page
+
+    @staticmethod
+    def _build(data: dict) -> type:
+        """
+        根据元素数据构建元素树，默认不要第一层的模块名，只保留元素；结构与page_codegen生成的模块一致
+        """
+        yaml_data: dict = next(iter(data.values()))
+
+        def create(key, value, current_path):
+            # 先创建子节点（支持元素嵌套子元素）
+            children = {k: create(k, v, f"{current_path}.{k}" if current_path else k)
+                        for k, v in value.items() if isinstance(v, dict)}
+            # 判断当前层级是否直接定义 method 和 path
+            if 'method' in value.keys() and 'path' in value.keys():
+                conflicts = set(children) & set(Element.__slots__)
+                if conflicts:
+                    error_log = f"元素配置错误: {current_path}的子元素{conflicts}与元素字段重名"
+                    LogUtils().errors(error_log)
+                    raise KeyError(error_log)
+                # 创建元素对象，存在子元素时子元素作为元素子类的类属性
+                element_class = type(key, (Element,), {'__slots__': (), **children}) if children else Element
+                return element_class(value['method'], value['path'], chain_name=current_path, timeout=value.get('timeout'),
+                                     input_mode=value.get('input_mode'))
+            # 创建模块对象
+            return _FrozenNamespace(key, (PageNamespace,), {'__slots__': (), '__qualname__': f'page.{current_path}' if current_path else 'page',
+                                                             **children})
+
+        return create('page', yaml_data, '')
+
+
+def iter_elements(node, parent: Optional[Element] = None) -> Iterator[Tuple[Element, Optional[Element]]]:
+    """
+    遍历元素树，父元素先于子元素
+    :param node: 元素树或其中的模块、元素
+    :param parent: 最近的父元素
+    :return: (元素, 最近的父元素)
+    """
+    attributes = vars(type(node)) if isinstance(node, Element) else vars(node)
+    for key, value in attributes.items():
+        if key.startswith('_'):
+            continue
+        if isinstance(value, Element):
+            yield value, parent
+            yield from iter_elements(value, value)
+        elif isinstance(value, type) and issubclass(value, PageNamespace):
+            yield from iter_elements(value, parent)
+
 
 class Page:
     """
     加载yaml文件中的元素信息，并返回所有元素对象。
-    element的元素文件名必须和operation的操作文件名一致，且位于elements目录下。
+    元素文件位于elements目录下，通过Page.bind装饰器绑定到页面对象类（按所在模块），
+    未绑定时元素文件名必须和operation的操作文件名一致。
+    元素树由PageRegistry在进程内共享，不可修改。
     加载元素后的结构示例：
         {模块：{元素：元素对象}}
     """
+    # 页面对象模块与元素文件的绑定：{模块名: 元素文件名}
+    _bindings: Dict[str, str] = {}
 
     def __init__(self, yaml_name: str = None):
         self.page = None
         # yaml文件路径
         yaml_dir = Path(os.getenv('HOME')) / 'page_object' / 'elements'
-        # 获取调用该类的文件名
-        caller_file = inspect.stack()[1].filename
-        # 元素文件名
-        yaml_name = yaml_name or Path(caller_file).stem + '.yaml'
+        if not yaml_name:
+            # 按调用方所在模块查找绑定的元素文件，未绑定时使用调用方文件名；sys._getframe不读取源码，开销远小于inspect.stack()
+            caller = sys._getframe(1)
+            yaml_name = self._bindings.get(caller.f_globals.get('__name__')) or Path(caller.f_code.co_filename).stem + '.yaml'
         yaml_path = yaml_dir / yaml_name
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                yaml = YAML()
-                self.data: CommentedMap = yaml.load(f)
-                if not self.data:
-                    error_log = f"元素文件为空: {yaml_path}"
-                    LogUtils().errors(error_log)
-                    raise Exception(error_log)
+            self.data, self._tree = PageRegistry.get(yaml_path)
         except FileNotFoundError as e:
             error_log = f"元素文件未找到: {yaml_path}! {e}"
             LogUtils().errors(error_log)
@@ -62,47 +232,23 @@ class Page:
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
+    @classmethod
+    def bind(cls, yaml_name: str):
+        """
+        页面对象类装饰器，导入时将类所在模块绑定到元素文件，模块内（含嵌套类）的Page()均加载该文件
+        :param yaml_name: elements目录下的元素文件名
+        """
+        def decorator(page_class):
+            cls._bindings[page_class.__module__] = yaml_name
+            return page_class
+        return decorator
 
     def load(self):
         """
         加载yaml文件中的元素信息，并返回所有元素对象。
         """
-        # 默认不要第一层的模块名，只保留元素，不能直接使用data.values()，否则返回一个CommentedMapView视图对象
-        yaml_data: CommentedMap = iter(self.data.values()).__next__()
-
-        # 阶段1：创建所有对象
-        def create_page_stage1(data, parent, parent_path="") -> object:
-            for key, value in data.items():
-                current_path = f"{parent_path}.{key}" if parent_path else key
-                if isinstance(value, dict):
-                    # 修复逻辑：判断当前层级是否直接定义 method 和 path
-                    is_element = 'method' in value.keys() and 'path' in value.keys()
-
-                    if is_element:
-                        # 创建元素对象
-                        try:
-                            element = Element(value['method'], value['path'])
-                            setattr(parent, key, element)
-                        except KeyError as e:
-                            error_log = f"元素配置错误: {key} {value} {e}"
-                            LogUtils().errors(error_log)
-                            raise KeyError(error_log)
-                        # 递归处理子元素（支持元素嵌套子元素）
-                        create_page_stage1(value, element, current_path)
-                    else:
-                        # 创建模块对象
-                        module = type(key, (object,), {})()
-                        setattr(parent, key, module)
-                        create_page_stage1(value, module, current_path)
-            return parent
-
-        # 执行加载
-        try:
-            self.page = create_page_stage1(yaml_data, type('Page', (object,), {})())
-            return self.page
-        except Exception as e:
-            LogUtils().errors(f"加载页面对象失败: {str(e)}")
-            raise
+        self.page = self._tree
+        return self.page
 
     def __getattr__(self, item):
         # 增加链式访问
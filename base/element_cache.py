@@ -0,0 +1,48 @@
+from typing import Dict, Optional, Tuple
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from common import Config
+
+
+class ElementCache:
+    """
+    已定位元素缓存，每个驱动一份，由BrowserState持有
+    键为(Frame路径, 父元素键, 定位方式, 路径)，同一页面内重复定位同一元素时直接返回缓存的WebElement，
+    跳转页面、页面内操作（点击、输入、悬停等可能引起重新渲染）后清空，元素失效（StaleElementReferenceException）时移除对应条目并重新定位。
+    配置：config.ini [locator] element_cache
+    """
+
+    def __init__(self):
+        self.enabled = Config.getini('locator', 'element_cache', bool)
+        self._elements: Dict[tuple, WebElement] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, frame_path: Tuple[str, ...], key: tuple) -> Optional[WebElement]:
+        """
+        读取缓存，未命中时返回None
+        :param frame_path: 元素所在的Frame路径
+        :param key: 元素键，见Locator._cache_key
+        """
+        if not self.enabled:
+            return None
+        web_element = self._elements.get((frame_path, *key))
+        if web_element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return web_element
+
+    def put(self, frame_path: Tuple[str, ...], key: tuple, web_element: WebElement):
+        if self.enabled:
+            self._elements[(frame_path, *key)] = web_element
+
+    def discard(self, frame_path: Tuple[str, ...], key: tuple):
+        """
+        移除失效的元素
+        """
+        self._elements.pop((frame_path, *key), None)
+
+    def clear(self):
+        self._elements.clear()
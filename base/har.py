@@ -0,0 +1,277 @@
+import base64
+import json
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+import trio
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from common import Config, LogUtils
+
+
+class HarInterceptor:
+    """
+    后端接口录制/回放
+    通过CDP Fetch域拦截页面发出的XHR/Fetch请求（Fetch.requestPaused事件）：
+        record：在响应阶段拦截，记录请求和响应后放行，按测试用例写入HAR文件
+        replay：在请求阶段拦截，按方法、URL和请求体匹配HAR中的响应直接返回，不再访问后端；
+                同一请求录制了多次时按录制顺序依次返回，最后一次重复使用
+    未匹配请求的处理方式unmatched：passthrough（访问真实后端）、fail（请求失败）、not_found（返回404）
+    CDP事件监听运行在后台线程的trio事件循环中。
+    配置：config.ini [har] mode、url_patterns、unmatched，HAR目录：data/har
+    """
+
+    def __init__(self, driver: WebDriver, mode: Literal['record', 'replay'], url_patterns: List[str] = None,
+                 unmatched: Literal['passthrough', 'fail', 'not_found'] = 'passthrough'):
+        self.driver = driver
+        self.mode = mode
+        self.url_patterns = url_patterns or ['*']
+        self.unmatched = unmatched
+        self.har_path: Optional[Path] = None
+        self._lock = threading.Lock()
+        # 录制的条目
+        self._entries: List[dict] = []
+        # 回放的响应：{(方法, URL, 请求体): 响应队列}
+        self._responses: Dict[tuple, deque] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._trio_token = None
+        self._cancel_scope: Optional[trio.CancelScope] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        # 已调用stop，启动超时后才建立的监听会立即退出并关闭拦截
+        self._stopped = False
+        # 拦截的标签页，CDP连接绑定在启动时的标签页上
+        self.window_handle: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, driver: WebDriver) -> Optional['HarInterceptor']:
+        """
+        按config.ini [har]配置创建拦截器，mode为off时返回None
+        """
+        mode = Config.getini('har', 'mode')
+        if mode == 'off':
+            return None
+        url_patterns = [pattern.strip() for pattern in Config.getini('har', 'url_patterns').split(',') if pattern.strip()]
+        return cls(driver, mode, url_patterns, Config.getini('har', 'unmatched'))
+
+    @staticmethod
+    def har_path_for(nodeid: str) -> Path:
+        """
+        测试用例对应的HAR文件路径
+        """
+        name = re.sub(r'[^\w\-.\[\]]+', '_', nodeid)
+        return Path(os.getenv('HOME')) / 'data' / 'har' / f'{name}.har'
+
+    @staticmethod
+    def _key(method: str, url: str, body: Optional[str]) -> tuple:
+        return method.upper(), url, body or ''
+
+    def start(self, har_path: Path):
+        """
+        启动拦截
+        :param har_path: HAR文件路径，录制时写入，回放时读取
+        """
+        self.switch(har_path)
+        self.window_handle = self.driver.current_window_handle
+        self._thread = threading.Thread(target=trio.run, args=(self._serve,), name='har-interceptor', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(30):
+            # 未在超时内建立监听，停止拦截，避免Fetch.enable生效后无人处理请求
+            self.stop()
+            error_log = f'HAR{self.mode}启动超时！30秒内未建立CDP监听'
+            LogUtils().errors(error_log)
+            raise TimeoutError(error_log)
+        if self._error:
+            raise self._error
+        LogUtils().debug(f'HAR{self.mode}已启动：{self.url_patterns}')
+
+    @property
+    def attached(self) -> bool:
+        """
+        是否仍在拦截驱动当前的标签页；驱动池重置驱动时会换用新标签页，原CDP连接随旧标签页关闭而失效
+        """
+        return not self._stopped and self.driver.current_window_handle == self.window_handle
+
+    def switch(self, har_path: Path):
+        """
+        切换HAR文件，通常每个测试用例一个文件；录制模式下先保存当前文件
+        """
+        with self._lock:
+            if self.mode == 'record':
+                self._save()
+                self._entries = []
+            else:
+                self._responses = self._load(har_path)
+            self.har_path = har_path
+
+    def stop(self):
+        """
+        停止拦截，录制模式下保存当前文件
+        """
+        self._stopped = True
+        if self._trio_token and self._cancel_scope:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except trio.RunFinishedError:
+                pass
+        if self._thread:
+            self._thread.join(10)
+        with self._lock:
+            if self.mode == 'record':
+                self._save()
+        LogUtils().debug(f'HAR{self.mode}已停止')
+
+    def _load(self, har_path: Path) -> Dict[tuple, deque]:
+        """
+        读取HAR文件中的响应
+        """
+        responses = defaultdict(deque)
+        if not har_path.exists():
+            LogUtils().debug(f'HAR文件不存在：{har_path}，所有请求按{self.unmatched}处理')
+            return responses
+        har = json.loads(har_path.read_text(encoding='utf-8'))
+        for entry in har['log']['entries']:
+            request, response = entry['request'], entry['response']
+            key = self._key(request['method'], request['url'], request.get('postData', {}).get('text'))
+            responses[key].append(response)
+        return responses
+
+    def _save(self):
+        """
+        写出当前录制的HAR文件，没有条目时不写
+        """
+        if not self.har_path or not self._entries:
+            return
+        har = {'log': {'version': '1.2', 'creator': {'name': 'HarInterceptor', 'version': '1.0'}, 'entries': self._entries}}
+        self.har_path.parent.mkdir(parents=True, exist_ok=True)
+        self.har_path.write_text(json.dumps(har, ensure_ascii=False, indent=2), encoding='utf-8')
+        LogUtils().debug(f'HAR已保存：{self.har_path}，共{len(self._entries)}条')
+
+    async def _serve(self):
+        """
+        建立CDP连接并处理Fetch.requestPaused事件
+        """
+        try:
+            async with self.driver.bidi_connection() as connection:
+                session, devtools = connection.session, connection.devtools
+                stage = devtools.fetch.RequestStage.RESPONSE if self.mode == 'record' else devtools.fetch.RequestStage.REQUEST
+                patterns = [
+                    devtools.fetch.RequestPattern(url_pattern=url_pattern, resource_type=resource_type, request_stage=stage)
+                    for url_pattern in self.url_patterns
+                    for resource_type in (devtools.network.ResourceType.XHR, devtools.network.ResourceType.FETCH)
+                ]
+                await session.execute(devtools.fetch.enable(patterns=patterns))
+                events = session.listen(devtools.fetch.RequestPaused, buffer_size=100)
+                with trio.CancelScope() as self._cancel_scope:
+                    self._trio_token = trio.lowlevel.current_trio_token()
+                    self._ready.set()
+                    if self._stopped:
+                        self._cancel_scope.cancel()
+                    async with trio.open_nursery() as nursery:
+                        async for event in events:
+                            handler = self._record if self.mode == 'record' else self._replay
+                            nursery.start_soon(handler, session, devtools, event)
+                await session.execute(devtools.fetch.disable())
+        except BaseException as e:
+            self._error = e
+            LogUtils().errors(f'HAR拦截异常！{e}')
+        finally:
+            self._ready.set()
+
+    async def _record(self, session, devtools, event):
+        """
+        录制：读取响应体后放行
+        """
+        request = event.request
+        try:
+            if event.response_status_code and event.response_status_code not in (301, 302, 303, 307, 308):
+                body, base64_encoded = await session.execute(devtools.fetch.get_response_body(event.request_id))
+            else:
+                body, base64_encoded = '', False
+            entry = {
+                'startedDateTime': datetime.now(timezone.utc).isoformat(),
+                'time': 0,
+                'request': {
+                    'method': request.method,
+                    'url': request.url,
+                    'httpVersion': 'HTTP/1.1',
+                    'headers': [{'name': k, 'value': v} for k, v in request.headers.items()],
+                    'queryString': [],
+                    'cookies': [],
+                    'headersSize': -1,
+                    'bodySize': len(request.post_data or ''),
+                    **({'postData': {'mimeType': request.headers.get('Content-Type', ''), 'text': request.post_data}} if request.post_data else {}),
+                },
+                'response': {
+                    'status': event.response_status_code or 0,
+                    'statusText': event.response_status_text or '',
+                    'httpVersion': 'HTTP/1.1',
+                    'headers': [{'name': h.name, 'value': h.value} for h in event.response_headers or []],
+                    'cookies': [],
+                    'content': {
+                        'size': len(body),
+                        'mimeType': next((h.value for h in event.response_headers or [] if h.name.lower() == 'content-type'), ''),
+                        'text': body,
+                        **({'encoding': 'base64'} if base64_encoded else {}),
+                    },
+                    'redirectURL': '',
+                    'headersSize': -1,
+                    'bodySize': -1,
+                },
+                'cache': {},
+                'timings': {'send': 0, 'wait': 0, 'receive': 0},
+            }
+            with self._lock:
+                self._entries.append(entry)
+        except Exception as e:
+            LogUtils().errors(f'HAR录制失败：{request.method} {request.url} {e}')
+        await self._release(session, devtools, event)
+
+    async def _replay(self, session, devtools, event):
+        """
+        回放：返回匹配的录制响应，未匹配时按unmatched处理
+        """
+        request = event.request
+        key = self._key(request.method, request.url, request.post_data)
+        try:
+            with self._lock:
+                queue = self._responses.get(key)
+                response = (queue.popleft() if len(queue) > 1 else queue[0]) if queue else None
+            if response:
+                content = response['content']
+                body = content.get('text', '')
+                if content.get('encoding') != 'base64':
+                    body = base64.b64encode(body.encode('utf-8')).decode('ascii')
+                headers = [devtools.fetch.HeaderEntry(name=h['name'], value=h['value']) for h in response['headers']
+                           if h['name'].lower() not in ('content-length', 'content-encoding', 'transfer-encoding')]
+                await session.execute(devtools.fetch.fulfill_request(
+                    event.request_id, response_code=response['status'], response_headers=headers, body=body))
+                return
+            LogUtils().debug(f'HAR未匹配：{request.method} {request.url}，按{self.unmatched}处理')
+            if self.unmatched == 'fail':
+                await session.execute(devtools.fetch.fail_request(event.request_id, devtools.network.ErrorReason.FAILED))
+            elif self.unmatched == 'not_found':
+                await session.execute(devtools.fetch.fulfill_request(event.request_id, response_code=404, body=''))
+            else:
+                await session.execute(devtools.fetch.continue_request(event.request_id))
+        except Exception as e:
+            # 单个请求处理失败（如HAR条目有误、页面已关闭）不能中断监听，否则后续请求一直挂起
+            LogUtils().errors(f'HAR回放失败：{request.method} {request.url} {e}')
+            await self._release(session, devtools, event)
+
+    async def _release(self, session, devtools, event):
+        """
+        放行暂停的请求，放行失败时使其失败，两者都失败（如页面已关闭）时只记录日志，不中断监听
+        """
+        try:
+            await session.execute(devtools.fetch.continue_request(event.request_id))
+        except Exception as e:
+            try:
+                await session.execute(devtools.fetch.fail_request(event.request_id, devtools.network.ErrorReason.FAILED))
+            except Exception as fail_error:
+                LogUtils().errors(f'HAR放行请求失败：{event.request.url} {e} {fail_error}')
@@ -1,50 +1,167 @@
-from typing import Union, Optional, List
-from selenium.common import NoSuchFrameException
+import time
+from contextlib import contextmanager
+from typing import Union, Optional, List, Literal, Callable, Any, Tuple, Dict
+from selenium.common import NoSuchFrameException, StaleElementReferenceException
 from selenium.webdriver import Keys, ActionChains
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
+from base.action_batch import ActionBatch
 from base.driver import Driver
+from base.webdriver import WebDriver
+from base.adaptive_timeout import TimeoutHistory
 from base.element import Element
-from common import LogUtils, PublicData
+from base.browser_state import BrowserState
+from base.network import NetworkIdle
+from base.waits import get_wait_engine
+from common import LogUtils, PublicData, Config
+
+# 操作完成的判断条件：Element（等待该元素可见），或(条件名称, Element)，条件名称见base.waits
+Until = Union[Element, Tuple[str, Element], None]
 
 
 class Locator:
     """元素定位器，支持链式元素加载和基础操作"""
     wait_time = 10
+    # 网络空闲检测器：{driver的session_id: NetworkIdle}
+    _network_trackers = {}
+    # 进行中的批量操作：{driver的session_id: ActionBatch}
+    _batches = {}
+    # 页面内定位子元素的函数，子元素路径以/开头的xpath按相对当前元素处理
+    _child_js = """
+        const child = (e, method, path) => {
+            if (!e || !path) return e;
+            if (method === 'xpath') {
+                const xpath = path.startsWith('/') ? '.' + path : path;
+                return document.evaluate(xpath, e, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            }
+            return e.querySelector(path);
+        };
+    """
+    # 批量读取元素数据的脚本，arguments: [元素列表, 子元素定位方式, 子元素路径, 字段列表]
+    # 字段text为innerText，其余优先读取属性值，不存在时读取特性
+    _snapshot_js = _child_js + """
+        const [elements, method, path, fields] = arguments;
+        const read = (e, field) => field === 'text' ? e.innerText : (field in e ? e[field] : e.getAttribute(field));
+        return elements.map(e => child(e, method, path)).map(e => e ? fields.map(f => read(e, f)) : fields.map(() => null));
+    """
+    # 页面内按文本查找元素的脚本，arguments: [上下文, 定位方式, 路径, 文本, 匹配方式, 比较文本的子元素, 返回的子元素]
+    _find_by_text_js = _child_js + """
+        const [root, method, path, text, match, textOf, target] = arguments;
+        let items;
+        if (method === 'xpath') {
+            const result = document.evaluate(path, root || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            items = Array.from({length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+        } else {
+            items = Array.from((root || document).querySelectorAll(path));
+        }
+        const textOfNode = (e) => {
+            const node = textOf ? child(e, textOf[0], textOf[1]) : e;
+            return node ? (node.innerText || '').trim() : null;
+        };
+        const hit = items.find(e => {
+            const value = textOfNode(e);
+            return value !== null && (match === 'exact' ? value === text : value.includes(text));
+        });
+        return hit ? (target ? child(hit, target[0], target[1]) : hit) : null;
+    """
+    # 脚本输入，arguments: [[元素, 值], ...]
+    # 元素不是输入框时（如antd的包裹span）使用其内部第一个输入框；通过原生value setter设置值，使React受控组件能感知变化
+    _fill_js = """
+        const [items] = arguments;
+        for (const [e, value] of items) {
+            const input = e.matches('input, textarea, select') ? e : e.querySelector('input, textarea, select');
+            if (!input) throw new Error('input not found');
+            const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(input), 'value').set;
+            input.focus();
+            setter.call(input, value);
+            input.dispatchEvent(new Event('input', {bubbles: true}));
+            input.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    """
 
-    def __init__(self, element: Optional[Element] = None, parent: Optional['Locator'] = None, web_element: Optional[WebElement] = None):
+    def __init__(self, element: Optional[Element] = None, parent: Optional['Locator'] = None, web_element: Optional[WebElement] = None,
+                 driver: Optional[WebDriver] = None):
         """
         初始化定位器
+        :param driver: 绑定的驱动（如驱动池租借的驱动），为空时沿用父节点驱动，否则使用全局Driver
         """
-        self.driver = Driver().driver
+        self.driver = driver or (parent.driver if parent else Driver().driver)
         # 父节点
         self._parent = parent
         self._element = element
         self._web_element = web_element
+        # 延迟定位：构造时不定位，首次操作或访问web_element时才定位；
+        # 按Element定位的元素失效时可重新定位，直接传入web_element的（如load_elements、find_by_text的结果）不可重新定位
+        self._relocatable = element is not None and web_element is None
 
-        if element and not web_element:
+    @property
+    def web_element(self) -> Optional[WebElement]:
+        """
+        定位到的元素，首次访问时定位
+        """
+        if self._web_element is None and self._element:
             self._locate_element()
+        return self._web_element
+
+    def _invalidate(self):
+        """
+        元素失效，清除当前及可重新定位的父节点的定位结果，下次访问时重新定位
+        """
+        state = BrowserState.of(self.driver)
+        locator = self
+        while locator and locator._relocatable:
+            state.elements.discard(state.frame_path, locator._cache_key())
+            locator._web_element = None
+            locator = locator._parent
+
+    def _with_element(self, action: Callable[[WebElement], Any]) -> Any:
+        """
+        对定位到的元素执行操作，元素失效（StaleElementReferenceException）时重新定位后重试一次
+        :param action: 操作，参数为元素
+        :return: 操作结果
+        """
+        try:
+            return action(self.web_element)
+        except StaleElementReferenceException:
+            if not self._relocatable:
+                raise
+            LogUtils().debug(f"元素已失效，重新定位: {self._element.path}")
+            self._invalidate()
+            return action(self.web_element)
+
+    def _cache_key(self) -> tuple:
+        """
+        元素缓存键：(父元素键, 定位方式, 路径)，父节点不可重新定位时使用其元素ID
+        """
+        if not self._parent:
+            parent_key = None
+        elif self._parent._relocatable:
+            parent_key = self._parent._cache_key()
+        else:
+            parent_key = self._parent._web_element.id if self._parent._web_element else None
+        return parent_key, self._element.method, self._element.path
 
     def _locate_element(self):
-        """执行元素定位核心逻辑"""
+        """执行元素定位核心逻辑，优先使用元素缓存"""
+        state = BrowserState.of(self.driver)
+        key = self._cache_key()
+        self._web_element = state.elements.get(state.frame_path, key)
+        if self._web_element is not None:
+            return
         try:
-            # 当存在parent_element时，说明存在父节点，需要根据父节点进行定位
+            try:
+                # 存在父节点时在父节点内定位，父节点未定位时先定位父节点
+                self._web_element = self.wait_until('presence_of_element_located', self._element)
+            except StaleElementReferenceException:
+                # 父节点已失效，重新定位父节点后重试
+                if not (self._parent and self._parent._relocatable):
+                    raise
+                self._parent._invalidate()
+                self._web_element = self.wait_until('presence_of_element_located', self._element)
+            state.elements.put(state.frame_path, key, self._web_element)
             if self._parent:
-                # 父节点未定位，先定位父节点
-                if not self._parent._web_element:
-                    self._parent._locate_element()
-                self._web_element = WebDriverWait(self._parent._web_element, self.wait_time).until(
-                    EC.presence_of_element_located(
-                        (self._element.method, self._element.path)
-                    )
-                )
                 LogUtils().debug(f"子元素定位成功 | 父: {self._parent._element.path} ➔ 子: {self._element.path}")
-            # 否则直接使用element进行定位
             else:
-                self._web_element = WebDriverWait(self.driver, self.wait_time).until(
-                    EC.presence_of_element_located((self._element.method, self._element.path))
-                )
                 LogUtils().debug(f"元素定位成功: {self._element.path}")
         except Exception as e:
             error_msg = f"元素定位失败: {self._element.path} - {str(e)}"
@@ -52,25 +169,57 @@ class Locator:
             raise Exception(error_msg)
 
     def load_element(self, element: Element) -> 'Locator':
-        """加载子元素（返回新Locator实例实现链式）"""
-        if self._parent:
-            return Locator(element=element, parent=self)
-        else:
-            return Locator(element=element)
+        """
+        加载元素（返回新Locator实例实现链式）：在元素定位器上调用时为其子元素，在页面定位器（未绑定元素）上调用时在整个页面（当前Frame）中定位
+        """
+        if self._element is not None or self._web_element is not None:
+            return Locator(element=element, parent=self, driver=self.driver)
+        return Locator(element=element, driver=self.driver)
+
+    @staticmethod
+    def _child_element(element: Element) -> Element:
+        """
+        子元素在父元素内定位时，以/开头的xpath按相对父元素处理（与_child_js一致），否则find_element、document.evaluate会在整个文档中查找
+        """
+        if element.method != 'xpath' or not element.path.startswith('/'):
+            return element
+        return Element(element.method, '.' + element.path, chain_name=element.chain_name, timeout=element.timeout,
+                       input_mode=element.input_mode)
+
+    def wait_until(self, condition: str, element: Optional[Element] = None, arg=None, timeout: Optional[float] = None):
+        """
+        按配置的等待引擎（config.ini [locator] wait_engine）等待条件成立，存在父节点时在父节点内定位
+        未指定超时时，元素相关条件使用根据定位耗时历史得出的自适应超时和轮询间隔，并记录本次耗时
+        :param condition: 条件名称，与expected_conditions一致，见base.waits
+        :param element: 元素，页面级条件可为空
+        :param arg: 条件参数
+        :param timeout: 超时时间（秒），默认wait_time
+        :return: 条件结果
+        """
+        root = self._parent.web_element if self._parent else None
+        target = self._child_element(element) if element and root is not None else element
+        engine = get_wait_engine(self.driver)
+        if timeout or not element:
+            return engine.until(condition, target, root, arg, timeout or self.wait_time)
+        history = TimeoutHistory()
+        timeout, poll = history.settings(element, self.wait_time)
+        start = time.perf_counter()
+        result = engine.until(condition, target, root, arg, timeout, poll)
+        history.record(element, time.perf_counter() - start)
+        return result
+
+    def _locate_elements(self, element: Element) -> List[WebElement]:
+        """定位元素列表"""
+        return self.wait_until('presence_of_all_elements_located', element)
 
     def load_elements(self, element: Element) -> List['Locator']:
         """加载元素列表（支持链式操作）"""
         try:
             # 定位所有元素
-            context = self._parent._web_element if self._parent else self.driver
-            web_elements = WebDriverWait(context, self.wait_time).until(
-                EC.presence_of_all_elements_located(
-                    (self._element.method, self._element.path)
-                )
-            )
+            web_elements = self._locate_elements(element)
             parent = self._parent if self._parent else None
             return [
-                Locator(Element(method=element.method, path=f"{element.path}[{i + 1}]"), parent=parent, web_element=el)
+                Locator(Element(method=element.method, path=f"{element.path}[{i + 1}]"), parent=parent, web_element=el, driver=self.driver)
                 for i, el in enumerate(web_elements)
             ]
         except Exception as e:
@@ -78,12 +227,18 @@ class Locator:
             LogUtils().error(error_msg)
             raise Exception(error_msg)
 
-    def switch_frame(self):
+    def switch_frame(self, force: bool = False):
         """
-        切换Frame
+        切换Frame，已位于该Frame内时不再切换
+        :param force: 是否强制切换
         """
+        state = BrowserState.of(self.driver)
+        if not force and state.in_frame(self._element.path):
+            LogUtils().debug(f'已位于Frame{self._element.path}内，跳过切换！')
+            return
         try:
-            self.driver.switch_to.frame(self._web_element)
+            self._with_element(self.driver.switch_to.frame)
+            state.enter_frame(self._element.path)
             debug_log = f'切换Frame{self._element.path}成功！'
             LogUtils().debug(debug_log)
         except NoSuchFrameException as e:
@@ -95,14 +250,62 @@ class Locator:
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
-    def click(self):
+    def _wait_for(self, until: Until):
         """
-        单击操作
+        等待操作完成的条件成立，条件元素在整个页面（当前Frame）中定位
+        :param until: 条件，为空时不等待
+        """
+        if until is None:
+            return
+        condition, element = ('visibility_of_element_located', until) if isinstance(until, Element) else until
+        Locator(driver=self.driver).wait_until(condition, element)
+        LogUtils().debug(f'{self._element.path}操作完成：{condition} {element.path}')
+
+    @contextmanager
+    def batch(self):
+        """
+        批量操作：with块内同一驱动的click、double_click、input、hover只定位元素并加入操作队列，
+        退出with块时通过一次W3C Actions调用执行；带until条件的操作会先执行已加入的操作再等待。
+        with块内抛出异常时不执行未发送的操作，嵌套使用时并入外层批量操作
         """
+        session_id = self.driver.session_id
+        if session_id in self._batches:
+            yield self._batches[session_id]
+            return
+        batch = self._batches[session_id] = ActionBatch(self.driver)
         try:
-            self._web_element.click()
-            debug_log = f'{self._element.path}元素点击！'
+            yield batch
+            batch.perform()
+        finally:
+            self._batches.pop(session_id, None)
+
+    def _act(self, debug_log: str, action: Callable[[WebElement], Any], chain: Callable[[ActionChains, WebElement], Any],
+             until: Until = None):
+        """
+        执行操作：处于批量操作中时加入队列，否则立即执行
+        :param debug_log: 操作日志
+        :param action: 立即执行的方法，参数为元素
+        :param chain: 加入ActionChains的方法，参数为(ActionChains, 元素)
+        :param until: 操作完成的条件
+        """
+        batch = self._batches.get(self.driver.session_id)
+        if batch:
+            self._with_element(lambda e: batch.add(debug_log, lambda actions: chain(actions, e)))
+            if until is not None:
+                batch.perform()
+        else:
+            self._with_element(action)
+            BrowserState.of(self.driver).dom_changed()
             LogUtils().debug(debug_log)
+        self._wait_for(until)
+
+    def click(self, until: Until = None):
+        """
+        单击操作
+        :param until: 点击完成的条件，如弹窗、菜单项可见，为空时不等待
+        """
+        try:
+            self._act(f'{self._element.path}元素点击！', lambda e: e.click(), lambda actions, e: actions.click(e), until)
         except Exception as e:
             error_log = f'{self._element.path}点击失败！{e}'
             LogUtils().errors(error_log)
@@ -113,38 +316,71 @@ class Locator:
         双击操作
         """
         try:
-            actions = ActionChains(self.driver)
-            actions.double_click(self._web_element).perform()
-            debug_log = f'{self._element.path}元素双击！'
-            LogUtils().debug(debug_log)
+            self._act(f'{self._element.path}元素双击！', lambda e: ActionChains(self.driver).double_click(e).perform(),
+                      lambda actions, e: actions.double_click(e))
         except Exception as e:
             error_log = f'{self._element.path}双击失败！{e}'
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
-    def input(self, text):
+    def input(self, text, until: Until = None, mode: Optional[Literal['keys', 'script']] = None):
         """
         输入操作
+        :param until: 输入完成的条件，如下拉候选项、校验提示可见，为空时不等待
+        :param mode: 输入方式，keys逐键输入，script通过脚本设置值，为空时使用元素yaml中配置的input_mode
         """
         try:
-            if text:
+            if text and (mode or self._element.input_mode) == 'script':
+                self._fill([(self, text)])
+                self._wait_for(until)
+            elif text:
                 # clear()函数不起作用，使用全选输入
-                self._web_element.send_keys(Keys.CONTROL, 'a')
-                self._web_element.send_keys(text)
-                debug_log = f'{self._element.path}输入{text}！'
-                LogUtils().debug(debug_log)
+                self._act(f'{self._element.path}输入{text}！', lambda e: (e.send_keys(Keys.CONTROL, 'a'), e.send_keys(text)),
+                          lambda actions, e: actions.click(e).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).send_keys(text),
+                          until)
         except Exception as e:
             error_log = f'{self._element.path}输入{text}失败！{e}'
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
+    def _fill(self, items: List[Tuple['Locator', str]]):
+        """
+        一次脚本调用设置多个输入框的值，元素失效时重新定位后重试一次；处于批量操作中时先执行已加入的操作
+        :param items: [(定位器, 值)]
+        """
+        batch = self._batches.get(self.driver.session_id)
+        if batch:
+            batch.perform()
+        try:
+            self.driver.execute_script(self._fill_js, [[locator.web_element, str(text)] for locator, text in items])
+        except StaleElementReferenceException:
+            for locator, _ in items:
+                locator._invalidate()
+            self.driver.execute_script(self._fill_js, [[locator.web_element, str(text)] for locator, text in items])
+        BrowserState.of(self.driver).dom_changed()
+        for locator, text in items:
+            LogUtils().debug(f'{locator._element.path}脚本输入{text}！')
+
+    def fill(self, values: Dict[Element, str]):
+        """
+        一次脚本调用填写多个输入框，适用于表单、数据驱动的多字段输入，值为空的字段跳过
+        :param values: {元素: 值}，元素按load_element的规则定位
+        """
+        items = [(self.load_element(element), text) for element, text in values.items() if text]
+        try:
+            self._fill(items)
+        except Exception as e:
+            error_log = f'{[locator._element.path for locator, _ in items]}批量输入失败！{e}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+
     def get_text(self):
         """
         获取文本
         """
         try:
             # 通过js获取文本，可以解决部分元素获取文本为空的问题，原因是元素被隐藏或不可见
-            text = self.driver.execute_script("return arguments[0].innerText", self._web_element)
+            text = self._with_element(lambda e: self.driver.execute_script("return arguments[0].innerText", e))
             debug_log = f'{self._element.path}获取文本{text}！'
             LogUtils().debug(debug_log)
             return text
@@ -153,10 +389,86 @@ class Locator:
             LogUtils().errors(error_log)
             raise
 
-    def goto(self, api=None):
+    def snapshot(self, elements: Union[Element, List['Locator']], fields: List[str], child: Optional[Element] = None) -> List[dict]:
+        """
+        一次脚本调用批量读取元素列表的数据
+        :param elements: 元素列表的Element（先定位），或load_elements返回的定位器列表
+        :param fields: 读取的字段，text为innerText，其余为属性/特性名，如value、href、class
+        :param child: 子元素，读取每个元素下该子元素的数据（相对当前元素定位）
+        :return: [{字段: 值}]，子元素不存在时值为None
+        """
+        path = elements.path if isinstance(elements, Element) else [locator._element.path for locator in elements]
+        try:
+            if isinstance(elements, Element):
+                web_elements = self._locate_elements(elements)
+            else:
+                web_elements = [locator.web_element for locator in elements]
+            rows = self.driver.execute_script(
+                self._snapshot_js, web_elements,
+                child.method if child else None, child.path if child else None, fields
+            )
+            data = [dict(zip(fields, row)) for row in rows]
+            debug_log = f'{path}批量读取{fields}：{data}！'
+            LogUtils().debug(debug_log)
+            return data
+        except Exception as e:
+            error_log = f'{path}批量读取{fields}失败！{e}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+
+    def get_texts(self, elements: Union[Element, List['Locator']], child: Optional[Element] = None) -> List[str]:
         """
-        跳转到指定api
+        一次脚本调用批量获取元素列表的文本
+        :param elements: 元素列表的Element，或load_elements返回的定位器列表
+        :param child: 子元素，获取每个元素下该子元素的文本
+        """
+        return [row['text'] for row in self.snapshot(elements, ['text'], child)]
+
+    def get_attributes(self, elements: Union[Element, List['Locator']], name: str, child: Optional[Element] = None) -> list:
+        """
+        一次脚本调用批量获取元素列表的属性
+        :param elements: 元素列表的Element，或load_elements返回的定位器列表
+        :param name: 属性名
+        :param child: 子元素，获取每个元素下该子元素的属性
+        """
+        return [row[name] for row in self.snapshot(elements, [name], child)]
+
+    def find_by_text(self, element: Element, text: str, match: Literal['exact', 'contains'] = 'exact',
+                     child: Optional[Element] = None, text_of: Optional[Element] = None) -> 'Locator':
+        """
+        在页面内一次脚本调用完成"加载列表-比较文本-取匹配项"，返回匹配元素的定位器
+        :param element: 元素列表的Element
+        :param text: 要匹配的文本（innerText去除首尾空白）
+        :param match: 匹配方式，exact为完全相等，contains为包含
+        :param child: 返回匹配项下的该子元素（相对匹配项定位），为空时返回匹配项本身
+        :param text_of: 比较匹配项下该子元素的文本，为空时比较匹配项本身的文本
+        :return: 定位器
+        """
+        # 匹配结果由页面脚本确定，不是选择器；标识只用于日志和元素缓存键：(列表路径, 比较文本的子元素路径, 匹配方式, 文本, 返回的子元素路径)
+        path = repr((element.path, text_of.path if text_of else None, match, text, child.path if child else None))
+        try:
+            context = self._parent.web_element if self._parent else None
+            web_element = WebDriverWait(self.driver, self.wait_time).until(
+                lambda driver: driver.execute_script(
+                    self._find_by_text_js, context, element.method, element.path, text, match,
+                    [text_of.method, text_of.path] if text_of else None,
+                    [child.method, child.path] if child else None
+                )
+            )
+            LogUtils().debug(f"按文本定位成功: {path}")
+            return Locator(Element(method=(child or element).method, path=path), parent=self._parent,
+                           web_element=web_element, driver=self.driver)
+        except Exception as e:
+            error_log = f'按文本定位失败: {path} - {e}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+
+    def goto(self, api=None, wait_mode: Optional[Literal['ready_state', 'network_idle']] = None, force: bool = False):
+        """
+        跳转到指定api，浏览器已位于该页面时不再重新加载，只回到顶层文档
         :param api: api,若为空则直接访问ip
+        :param wait_mode: 页面就绪判断方式，见wait_for_page_load
+        :param force: 是否强制重新加载
         """
         ip = PublicData.get_constant_data()['spgz_ip']
         protocol = 'http://'
@@ -168,8 +480,21 @@ class Locator:
                 url = f'{protocol}{ip}'
             else:
                 url = f'{protocol}{ip}{api}'
+            state = BrowserState.of(self.driver)
+            # 最近一次跳转的就是该页面时，再确认浏览器当前URL（页面内操作可能已跳走）
+            if not force and state.url == url and self.driver.current_url == url:
+                if state.frame_path:
+                    self.driver.switch_to.default_content()
+                    state.exit_frames()
+                LogUtils().debug(f'已位于{url}，跳过跳转！')
+                return
+            # 等待网络空闲时，清空跳转前的网络事件，只统计新页面的请求
+            wait_mode = wait_mode or Config.getini('locator', 'page_load_mode')
+            if wait_mode == 'network_idle':
+                self._network_idle().reset()
             self.driver.get(url)
-            self.wait_for_page_load()
+            state.navigate(url)
+            self.wait_for_page_load(wait_mode)
             debug_log = f'跳转到{url}！'
             LogUtils().debug(debug_log)
         except Exception as e:
@@ -177,30 +502,47 @@ class Locator:
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
-    def hover(self, hover_time: Union[int, None] = 1):
+    def hover(self, hover_time: Union[int, None] = None, until: Until = None):
         """
-        鼠标悬停操作，默认3秒
+        鼠标悬停操作
+        :param hover_time: 悬停后固定停顿的秒数，默认不停顿，优先使用until
+        :param until: 悬停完成的条件，如菜单、弹出层可见，条件成立后立即返回
         """
         try:
-            actions = ActionChains(self.driver)
-            actions.move_to_element(self._web_element).perform()
-            actions.pause(hover_time).perform()
-            debug_log = f'{self._element.path}元素悬停{hover_time}秒！'
-            LogUtils().debug(debug_log)
+            def move(actions, e):
+                actions.move_to_element(e)
+                return actions.pause(hover_time) if hover_time else actions
+            debug_log = f'{self._element.path}元素悬停{f"{hover_time}秒" if hover_time else ""}！'
+            self._act(debug_log, lambda e: move(ActionChains(self.driver), e).perform(), move, until)
         except Exception as e:
             error_log = f'{self._element.path}悬停失败！{e}'
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
+    def _network_idle(self) -> NetworkIdle:
+        """
+        获取当前驱动的网络空闲检测器，同一驱动共用，保证跳转前后统计的是同一批请求
+        """
+        if self.driver.session_id not in self._network_trackers:
+            self._network_trackers[self.driver.session_id] = NetworkIdle(self.driver)
+        return self._network_trackers[self.driver.session_id]
+
     # 等待页面完全加载
-    def wait_for_page_load(self):
+    def wait_for_page_load(self, wait_mode: Optional[Literal['ready_state', 'network_idle']] = None):
         """
         等待页面完全加载
+        :param wait_mode: ready_state只判断document.readyState；network_idle在此基础上等待网络请求空闲（适用于SPA、iframe页面），
+                          为空时使用config.ini [locator] page_load_mode
         """
+        wait_mode = wait_mode or Config.getini('locator', 'page_load_mode')
         try:
-            WebDriverWait(self.driver, self.wait_time).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            get_wait_engine(self.driver).until('document_ready', timeout=self.wait_time)
+            if wait_mode == 'network_idle':
+                network_idle = self._network_idle()
+                if network_idle.available:
+                    network_idle.wait(self.wait_time)
+                else:
+                    LogUtils().debug('未开启性能日志，网络空闲检测退化为document.readyState')
             debug_log = f'页面{self.driver.current_url}加载完成！'
             LogUtils().debug(debug_log)
         except Exception as e:
@@ -0,0 +1,84 @@
+import json
+import time
+from fnmatch import fnmatch
+from typing import Dict, List
+
+from selenium.common import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from common import Config, LogUtils
+
+
+class NetworkIdle:
+    """
+    网络空闲检测
+    通过Chrome性能日志中的CDP Network.*事件跟踪进行中的请求（含iframe内请求），
+    无进行中的请求且持续quiet_ms毫秒后视为页面就绪；长轮询、流式接口等通过ignore列表排除。
+    性能日志需在启动配置中开启performance_log（config/launch_profile.yaml），未开启时退化为document.readyState检测。
+    配置：config.ini [locator] network_quiet_ms、network_ignore
+    """
+    _start_events = {'Network.requestWillBeSent'}
+    _end_events = {'Network.loadingFinished', 'Network.loadingFailed'}
+
+    def __init__(self, driver: WebDriver, quiet_ms: int = None, ignore: List[str] = None):
+        self.driver = driver
+        self.quiet = (quiet_ms if quiet_ms is not None else Config.getini('locator', 'network_quiet_ms', int)) / 1000
+        if ignore is None:
+            ignore = [pattern.strip() for pattern in Config.getini('locator', 'network_ignore').split(',') if pattern.strip()]
+        self.ignore = ignore
+        self.inflight: Dict[str, str] = {}
+
+    @property
+    def available(self) -> bool:
+        """
+        是否开启了性能日志
+        """
+        profile = getattr(self.driver, 'profile', None)
+        return bool(profile and profile.performance_log)
+
+    def reset(self):
+        """
+        清空已缓存的性能日志，通常在跳转前调用，避免统计到上一个页面的请求
+        """
+        if self.available:
+            self.driver.get_log('performance')
+        self.inflight.clear()
+
+    def _ignored(self, url: str) -> bool:
+        return url.startswith('data:') or any(fnmatch(url, pattern) for pattern in self.ignore)
+
+    def _consume(self) -> bool:
+        """
+        读取并处理性能日志
+        :return: 是否有网络活动
+        """
+        activity = False
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            if method in self._start_events:
+                url = params['request']['url']
+                if not self._ignored(url):
+                    self.inflight[params['requestId']] = url
+                    activity = True
+            elif method in self._end_events and self.inflight.pop(params['requestId'], None):
+                activity = True
+        return activity
+
+    def wait(self, timeout: float):
+        """
+        等待网络空闲
+        :param timeout: 超时时间（秒）
+        """
+        deadline = time.monotonic() + timeout
+        last_activity = time.monotonic()
+        while True:
+            if self._consume():
+                last_activity = time.monotonic()
+            now = time.monotonic()
+            if not self.inflight and now - last_activity >= self.quiet:
+                LogUtils().debug(f'网络空闲，等待{timeout - (deadline - now):.3f}s')
+                return
+            if now > deadline:
+                raise TimeoutException(f'网络空闲等待超时({timeout}s)，进行中的请求：{list(self.inflight.values())}')
+            time.sleep(min(0.1, self.quiet))
@@ -0,0 +1,116 @@
+"""
+页面模块生成
+将page_object/elements/*.yaml生成为page_object/generated下的Python模块：元素为不可修改的Element常量，模块为PageNamespace嵌套类，
+属性访问即普通的类属性查找，元素名拼写错误在导入、静态检查时即可发现。
+生成的模块记录yaml内容的sha1，yaml修改后未重新生成时PageRegistry自动退回运行时构建。
+运行：python -m base.page_codegen [--check]，--check只检查是否过期，存在过期模块时返回1
+"""
+import argparse
+import hashlib
+import keyword
+import sys
+from pathlib import Path
+from typing import List
+
+from ruamel.yaml import YAML
+
+from base.element import Element
+
+ROOT = Path(__file__).resolve().parents[1]
+ELEMENTS_DIR = ROOT / 'page_object' / 'elements'
+GENERATED_DIR = ROOT / 'page_object' / 'generated'
+INDENT = '    '
+
+
+def source_sha1(yaml_path: Path) -> str:
+    return hashlib.sha1(yaml_path.read_bytes()).hexdigest()
+
+
+def generated_path(yaml_path: Path) -> Path:
+    return GENERATED_DIR / f'{yaml_path.stem}.py'
+
+
+def _check_name(key: str, chain_name: str):
+    if not key.isidentifier() or keyword.iskeyword(key):
+        raise ValueError(f'{chain_name}: {key}不是合法的Python标识符')
+
+
+def _render_node(key: str, value: dict, chain_name: str, depth: int) -> List[str]:
+    """
+    生成一个节点（元素或模块）的代码行
+    """
+    _check_name(key, chain_name)
+    indent = INDENT * depth
+    children = [(k, v) for k, v in value.items() if isinstance(v, dict)]
+    child_lines = []
+    for child_key, child_value in children:
+        child_lines += _render_node(child_key, child_value, f'{chain_name}.{child_key}' if chain_name else child_key, depth + 1)
+    if 'method' in value and 'path' in value:
+        conflicts = {k for k, _ in children} & set(Element.__slots__)
+        if conflicts:
+            raise ValueError(f'{chain_name}: 子元素{conflicts}与元素字段重名')
+        arguments = [repr(value['method']), repr(value['path']), f'chain_name={chain_name!r}']
+        if value.get('timeout') is not None:
+            arguments.append(f"timeout={value['timeout']!r}")
+        if value.get('input_mode'):
+            arguments.append(f"input_mode={value['input_mode']!r}")
+        if not children:
+            return [f'{indent}{key} = Element({", ".join(arguments)})']
+        # 存在子元素时，子元素作为元素子类的类属性
+        return [f'{indent}class _{key}(Element):', f'{indent}{INDENT}__slots__ = ()'] + child_lines + [
+            f'{indent}{key} = _{key}({", ".join(arguments)})',
+            f'{indent}del _{key}',
+        ]
+    return [f'{indent}class {key}(PageNamespace):', f'{indent}{INDENT}__slots__ = ()'] + child_lines
+
+
+def render(yaml_path: Path) -> str:
+    """
+    生成yaml文件对应的模块代码
+    """
+    content = yaml_path.read_bytes()
+    data = YAML(typ='safe').load(content)
+    lines = [
+        f'# 由base.page_codegen根据page_object/elements/{yaml_path.name}生成，请勿手动修改',
+        'from base.element import Element, PageNamespace',
+        '',
+        f'SOURCE = {yaml_path.name!r}',
+        f'SOURCE_SHA1 = {hashlib.sha1(content).hexdigest()!r}',
+        '',
+        '',
+    ]
+    # 默认不要第一层的模块名，只保留元素
+    lines += _render_node('page', next(iter(data.values())), '', 0)
+    return '\n'.join(lines) + '\n'
+
+
+def is_fresh(yaml_path: Path) -> bool:
+    """
+    生成的模块是否与yaml内容一致
+    """
+    path = generated_path(yaml_path)
+    return path.exists() and f"SOURCE_SHA1 = {source_sha1(yaml_path)!r}" in path.read_text(encoding='utf-8')
+
+
+def generate_all():
+    GENERATED_DIR.mkdir(exist_ok=True)
+    (GENERATED_DIR / '__init__.py').touch()
+    for yaml_path in sorted(ELEMENTS_DIR.glob('*.yaml')):
+        generated_path(yaml_path).write_text(render(yaml_path), encoding='utf-8')
+        print(f'generated {generated_path(yaml_path).relative_to(ROOT)}')
+
+
+def check_all() -> bool:
+    stale = [yaml_path.name for yaml_path in sorted(ELEMENTS_DIR.glob('*.yaml')) if not is_fresh(yaml_path)]
+    for name in stale:
+        print(f'stale: {name}')
+    return not stale
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='根据元素yaml生成页面模块')
+    parser.add_argument('--check', action='store_true', help='只检查生成的模块是否过期')
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(0 if check_all() else 1)
+    generate_all()
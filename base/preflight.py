@@ -0,0 +1,123 @@
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from base.element import Element, Page, iter_elements
+from common import Config, LogUtils
+
+
+class Preflight:
+    """
+    页面元素预检
+    页面跳转后通过一次execute_async_script把元素文件中的全部元素发送到浏览器定位，返回各元素是否存在，
+    代替逐个元素查找、等待超时后才发现定位失效。脚本始终从顶层文档开始定位，与驱动当前所在的Frame无关；
+    指定Frame元素时，除Frame元素（及其子元素）外的元素均在该Frame的文档内定位（需同源）。
+    页面仍在渲染时，脚本在浏览器内轮询直到必需元素全部存在或超时，仍只有一次往返。
+    同一驱动、同一URL下已确认存在的元素会被缓存，再次预检时不再访问浏览器。
+    配置：config.ini [preflight]
+    """
+    # 已确认存在的元素：{(driver的session_id, 元素文件名, URL): {元素链式路径}}
+    _resolved: Dict[tuple, Set[str]] = {}
+    # arguments: [Frame元素的[定位方式, 路径]或null, [[定位方式, 路径, 父元素序号, 是否在Frame内], ...], 必需元素序号, 超时（毫秒）, 回调]
+    # 子元素在父元素的第一个匹配项内定位，路径以/开头的xpath按相对父元素处理（与Locator一致）
+    _script = """
+        const [frame, items, required, timeout, done] = arguments;
+        let topDocument;
+        try { topDocument = window.top.document; } catch (e) { topDocument = document; }
+        const find = (doc, context, method, path) => {
+            try {
+                if (method === 'xpath') {
+                    const xpath = context !== doc && path.startsWith('/') ? '.' + path : path;
+                    const node = doc.evaluate(xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                    return node && node.nodeType === Node.ELEMENT_NODE ? node : null;
+                }
+                return context.querySelector(path);
+            } catch (e) {
+                return null;
+            }
+        };
+        const check = () => {
+            let frameDocument = null;
+            if (frame) {
+                const frameElement = find(topDocument, topDocument, frame[0], frame[1]);
+                frameDocument = frameElement && frameElement.contentDocument;
+            }
+            const found = [];
+            for (const [method, path, parent, inFrame] of items) {
+                const doc = inFrame ? frameDocument : topDocument;
+                const context = parent === null ? doc : found[parent];
+                found.push(doc && context ? find(doc, context, method, path) : null);
+            }
+            return found.map(e => e !== null);
+        };
+        const deadline = Date.now() + timeout;
+        const poll = () => {
+            const result = check();
+            if (required.every(i => result[i]) || Date.now() >= deadline) done(result);
+            else setTimeout(poll, 100);
+        };
+        poll();
+    """
+
+    def __init__(self, driver: WebDriver, yaml_name: str, frame: str = None):
+        """
+        :param driver: 驱动
+        :param yaml_name: elements目录下的元素文件名，如home_page.yaml
+        :param frame: Frame元素的链式路径（如frame），为空时全部元素在顶层文档中定位
+        """
+        self.driver = driver
+        self.yaml_name = yaml_name
+        self.elements: Dict[str, Element] = {}
+        self._items = []
+        indexes = {}
+        for element, parent in iter_elements(Page(yaml_name).load()):
+            in_frame = frame is not None and element.chain_name != frame and not element.chain_name.startswith(f'{frame}.')
+            indexes[element.chain_name] = len(self._items)
+            self._items.append([element.method, element.path, indexes[parent.chain_name] if parent else None, in_frame])
+            self.elements[element.chain_name] = element
+        if frame is not None and frame not in self.elements:
+            error_log = f'预检失败！{yaml_name}中不存在Frame元素：{frame}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+        self._frame = [self.elements[frame].method, self.elements[frame].path] if frame else None
+        self._indexes = indexes
+
+    def check(self, required: Iterable[str] = (), timeout: float = 0) -> Dict[str, bool]:
+        """
+        一次调用定位全部元素
+        :param required: 必需元素的链式路径，浏览器内轮询直到这些元素全部存在
+        :param timeout: 轮询超时（秒），为0时只定位一次
+        :return: {元素链式路径: 是否存在}
+        """
+        required = [self._indexes[name] for name in required]
+        start = time.perf_counter()
+        try:
+            result = self.driver.execute_async_script(self._script, self._frame, self._items, required, int(timeout * 1000))
+        except Exception as e:
+            error_log = f'预检失败！{self.yaml_name} {e}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+        LogUtils().debug(f'预检{self.yaml_name}：{len(self._items)}个元素，存在{sum(result)}个，'
+                         f'耗时{(time.perf_counter() - start) * 1000:.0f}ms')
+        return dict(zip(self.elements, result))
+
+    def missing(self, required: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        检查必需元素是否存在，已在当前URL下确认存在时不再访问浏览器
+        :param required: 必需元素的链式路径，为空时为元素文件中的全部元素
+        :return: 不存在的元素
+        """
+        required = list(required or self.elements)
+        unknown = [name for name in required if name not in self.elements]
+        if unknown:
+            error_log = f'预检失败！{self.yaml_name}中不存在元素：{unknown}'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+        key = (self.driver.session_id, self.yaml_name, self.driver.current_url)
+        if self._resolved.get(key, set()).issuperset(required):
+            LogUtils().debug(f'预检{self.yaml_name}：必需元素已确认存在，跳过！')
+            return []
+        result = self.check(required, Config.getini('preflight', 'timeout', float))
+        self._resolved[key] = {name for name, exists in result.items() if exists}
+        return [name for name in required if not result[name]]
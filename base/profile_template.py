@@ -0,0 +1,119 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from selenium.webdriver.chrome.options import Options
+
+from common import LogUtils, PublicData
+
+
+class ProfileTemplate:
+    """
+    Chrome用户数据目录模板
+    预先启动一次浏览器访问平台（可选登录），让HTTP缓存中缓存好前端包、地图资源和字体，保存为模板目录；
+    之后每个驱动从模板复制一份独立的用户数据目录，首屏加载无需重新下载。
+    复制时优先使用写时复制（Linux cp --reflink、macOS cp -c），不支持时（如ext4）普通复制。
+    缓存目录不能使用硬链接：Chrome的simple cache、Service Worker数据库会原地改写文件，硬链接会使各副本与模板互相写穿。
+    模板目录：data/profiles/template，在启动配置中设置profile_template: true后由WebDriver自动使用。
+    """
+    # 浏览器运行时的锁文件，复制模板时不能带上
+    _lock_files = {'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile'}
+
+    def __init__(self, template_dir: Path = None):
+        self.template_dir = Path(template_dir or Path(os.getenv('HOME')) / 'data' / 'profiles' / 'template')
+
+    @property
+    def exists(self) -> bool:
+        return self.template_dir.is_dir() and any(self.template_dir.iterdir())
+
+    def build(self, warm: Optional[Callable] = None, profile: str = None):
+        """
+        构建模板：以模板目录为用户数据目录启动浏览器，执行预热后关闭浏览器
+        :param warm: 预热方法，参数为驱动，为空时访问平台首页
+        :param profile: 启动配置名称
+        """
+        from base.webdriver import WebDriver
+
+        if self.template_dir.exists():
+            shutil.rmtree(self.template_dir)
+        self.template_dir.mkdir(parents=True)
+        options = Options()
+        options.add_argument(f'--user-data-dir={self.template_dir}')
+        driver = WebDriver(options=options, profile=profile)
+        try:
+            if warm:
+                warm(driver)
+            else:
+                driver.get(f"http://{PublicData.get_constant_data()['spgz_ip']}")
+                driver.execute_async_script("const done = arguments[0]; window.addEventListener('load', () => done(), {once: true});"
+                                            "if (document.readyState === 'complete') done();")
+        finally:
+            driver.quit()
+        for lock_file in self._lock_files:
+            (self.template_dir / lock_file).unlink(missing_ok=True)
+        LogUtils().debug(f'浏览器模板构建完成：{self.template_dir}')
+
+    def clone(self) -> Path:
+        """
+        从模板复制一份用户数据目录
+        :return: 新的用户数据目录，使用完毕后调用cleanup删除
+        """
+        target = Path(tempfile.mkdtemp(prefix='chrome-profile-'))
+        if not self._reflink_copy(target):
+            shutil.copytree(self.template_dir, target, symlinks=True, dirs_exist_ok=True,
+                            ignore=lambda _, names: [name for name in names if name in self._lock_files])
+        LogUtils().debug(f'浏览器模板复制完成：{target}')
+        return target
+
+    def _reflink_copy(self, target: Path) -> bool:
+        """
+        写时复制，文件系统不支持时返回False
+        """
+        if sys.platform.startswith('linux'):
+            command = ['cp', '-a', '--reflink=always', f'{self.template_dir}/.', str(target)]
+        elif sys.platform == 'darwin':
+            command = ['cp', '-c', '-R', f'{self.template_dir}/.', str(target)]
+        else:
+            return False
+        result = subprocess.run(command, capture_output=True)
+        if result.returncode != 0:
+            # 清除失败时复制了一半的文件
+            shutil.rmtree(target, ignore_errors=True)
+            target.mkdir()
+            return False
+        return True
+
+    @staticmethod
+    def cleanup(user_data_dir: Path):
+        """
+        删除复制出的用户数据目录
+        """
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    # 构建模板：python -m base.profile_template [--login 用户名 密码] [--profile 启动配置]
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description='构建Chrome用户数据目录模板')
+    parser.add_argument('--login', nargs=2, metavar=('USERNAME', 'PASSWORD'), help='预热时登录平台')
+    parser.add_argument('--profile', help='启动配置名称，见config/launch_profile.yaml')
+    args = parser.parse_args()
+    load_dotenv(Path(__file__).resolve().parents[1] / 'env' / '.env')
+    load_dotenv(Path(__file__).resolve().parents[1] / 'env' / 'se-config.env')
+
+    def warm_up(driver):
+        from page_object import Index
+        index = Index(driver=driver)
+        if args.login:
+            index.login(*args.login)
+            index.locator.wait_for_page_load('network_idle')
+        else:
+            index.launch_index()
+
+    ProfileTemplate().build(warm_up, args.profile)
@@ -0,0 +1,249 @@
+"""
+元素定位离线检查
+通过Page加载page_object/elements下各yaml的全部元素，使用lxml/cssselect在保存的页面快照（data/dom_snapshots/<yaml名>/*.html）上执行定位，
+不启动浏览器。报告每个元素的匹配数量、歧义（匹配多个但yaml注释未标注"多个"）、定位方式与路径不符、返回非元素节点等问题，
+统计每个定位的执行耗时，并为绝对路径的XPath建议基于id/class/属性锚定的CSS。
+子元素（含后缀元素）沿父子链逐级在父元素的第一个匹配项内定位，与Locator一致。
+定位方式与路径是否相符不需要快照，所有元素都会检查；没有快照的页面只做该项检查并输出警告，--strict时视为错误。
+快照保存：在测试中调用save_snapshot(driver, 'home_page', 'map')，保存当前文档（切换Frame后为Frame内文档）。
+运行：python -m base.selector_lint [yaml名 ...] [--json 报告路径] [--strict]，存在错误时返回1
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cssselect import SelectorError
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+
+from base.element import Element, Page, iter_elements
+
+ROOT = Path(__file__).resolve().parents[1]
+ELEMENTS_DIR = ROOT / 'page_object' / 'elements'
+SNAPSHOT_DIR = ROOT / 'data' / 'dom_snapshots'
+# 动态生成、不宜作为锚点的id/class：uuid、长十六进制、CSS Modules哈希后缀（如title___2Meyb）
+UNSTABLE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}|[0-9a-f]{12,}|___|\d{4,}', re.I)
+ANCHOR_ATTRIBUTES = ('name', 'title', 'placeholder', 'type', 'role', 'aria-label')
+
+
+def save_snapshot(driver, page: str, name: str) -> Path:
+    """
+    保存当前文档的快照
+    :param driver: 驱动
+    :param page: yaml文件名（不含扩展名），如home_page
+    :param name: 快照名称
+    :return: 快照路径
+    """
+    path = SNAPSHOT_DIR / page / f'{name}.html'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(driver.page_source, encoding='utf-8')
+    return path
+
+
+def yaml_markers(yaml_path: Path) -> Dict[str, str]:
+    """
+    读取yaml中元素的行尾注释：{元素链式路径: 注释}，用于识别"多个"、"后缀"元素
+    """
+    markers, stack = {}, []
+    for line in yaml_path.read_text(encoding='utf-8').splitlines():
+        match = re.match(r'^(\s*)([\w-]+):\s*(?:#(.*))?$', line)
+        if not match:
+            continue
+        indent = len(match.group(1))
+        stack = [(i, key) for i, key in stack if i < indent] + [(indent, match.group(2))]
+        if match.group(3):
+            # 不要第一层的模块名，与Element.chain_name一致
+            markers['.'.join(key for _, key in stack[1:])] = match.group(3).strip()
+    return markers
+
+
+def compile_selector(method: str, path: str, relative: bool = False):
+    """
+    编译定位，相对父元素时以/开头的XPath按相对路径处理（与Locator一致）
+    """
+    if method == 'xpath':
+        return etree.XPath('.' + path if relative and path.startswith('/') else path)
+    return CSSSelector(path)
+
+
+def check_method(element: Element) -> Optional[str]:
+    """
+    检查定位方式与路径是否相符
+    :return: 错误信息，相符时为None
+    """
+    try:
+        compile_selector(element.method, element.path)
+        return None
+    except (etree.XPathSyntaxError, SelectorError) as e:
+        other = 'css selector' if element.method == 'xpath' else 'xpath'
+        try:
+            compile_selector(other, element.path)
+            return f'method为{element.method}，路径是{other}'
+        except (etree.XPathSyntaxError, SelectorError):
+            return f'路径无效：{e}'
+
+
+def measure(selector, context) -> float:
+    """
+    单次定位耗时（微秒），取多轮最小值
+    """
+    number = 20
+    return min(timeit.repeat(lambda: selector(context), number=number, repeat=3)) / number * 1e6
+
+
+def _stable(value: Optional[str]) -> bool:
+    return bool(value) and not UNSTABLE.search(value)
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def suggest_css(node, document) -> Optional[str]:
+    """
+    为唯一匹配的节点建议基于id/class/属性锚定的CSS，返回第一个在快照中唯一匹配该节点的候选
+    """
+    tag = node.tag
+    candidates = []
+    if _stable(node.get('id')):
+        candidates.append(f'[id={_css_string(node.get("id"))}]' if node.get('id')[0].isdigit() else f'#{node.get("id")}')
+    classes = [c for c in (node.get('class') or '').split() if _stable(c)]
+    candidates += [f'{tag}.{c}' for c in classes]
+    candidates += [f'{tag}[{a}={_css_string(node.get(a))}]' for a in ANCHOR_ATTRIBUTES if _stable(node.get(a))]
+    # 从最近的带稳定id的祖先开始逐级定位
+    steps, current = [], node
+    while current is not None and current.getparent() is not None:
+        parent = current.getparent()
+        if _stable(current.get('id')) and current is not node:
+            anchor = f'#{current.get("id")}' if not current.get('id')[0].isdigit() else f'[id={_css_string(current.get("id"))}]'
+            leaf = f'{tag}.{classes[0]}' if classes else None
+            if leaf:
+                candidates.append(f'{anchor} {leaf}')
+            candidates.append(' > '.join([anchor] + steps))
+            break
+        siblings = [c for c in parent if c.tag == current.tag]
+        steps.insert(0, current.tag if len(siblings) == 1 else f'{current.tag}:nth-of-type({siblings.index(current) + 1})')
+        current = parent
+    for candidate in candidates:
+        try:
+            if CSSSelector(candidate)(document) == [node]:
+                return candidate
+        except SelectorError:
+            continue
+    return None
+
+
+def resolve(element: Element, parents: Dict[str, Optional[Element]], document):
+    """
+    按Locator的父子链定位元素：从最顶层的祖先开始，每一级在上一级的第一个匹配项内定位
+    :param parents: {元素链式路径: 最近的父元素}
+    :return: 第一个匹配项，自身或任一祖先未匹配时返回None
+    """
+    parent = parents.get(element.chain_name)
+    context = document if parent is None else resolve(parent, parents, document)
+    if context is None:
+        return None
+    try:
+        matches = compile_selector(element.method, element.path, relative=parent is not None)(context)
+    except (etree.XPathError, SelectorError):
+        return None
+    return next((m for m in matches if isinstance(m, etree._Element)), None)
+
+
+def lint_element(element: Element, parents: Dict[str, Optional[Element]], marker: str, snapshots: Dict[str, object]) -> dict:
+    """
+    检查一个元素：定位方式与路径是否相符（不需要快照），再在全部快照上定位，取匹配数最多的快照报告
+    """
+    parent = parents.get(element.chain_name)
+    row = {'element': element.chain_name, 'method': element.method, 'path': element.path, 'count': 0, 'snapshot': None,
+           'time_us': None, 'errors': [], 'warnings': [], 'suggestion': None}
+    method_error = check_method(element)
+    if method_error:
+        row['errors'].append(method_error)
+        return row
+    if not snapshots:
+        return row
+    best = None
+    for name, document in snapshots.items():
+        context = resolve(parent, parents, document) if parent else document
+        if context is None:
+            continue
+        selector = compile_selector(element.method, element.path, relative=parent is not None)
+        try:
+            matches = selector(context)
+        except etree.XPathError as e:
+            row['errors'].append(f'执行失败：{e}')
+            return row
+        if best is None or len(matches) > len(best[1]):
+            best = (name, matches, selector, context, document)
+    if best is None or not best[1]:
+        row['errors'].append('父元素未匹配' if parent and best is None else '未匹配')
+        return row
+    name, matches, selector, context, document = best
+    row.update(count=len(matches), snapshot=name, time_us=round(measure(selector, context), 1))
+    if not all(isinstance(m, etree._Element) for m in matches):
+        row['errors'].append('返回非元素节点（如text()），Selenium无法定位')
+        return row
+    if len(matches) > 1 and '多个' not in marker:
+        row['warnings'].append(f'匹配{len(matches)}个，yaml未标注"多个"')
+    if element.method == 'xpath' and element.path.startswith('/html') and not parent:
+        row['warnings'].append('绝对路径，页面结构变化时易失效')
+    if len(matches) == 1 and not parent and (element.method == 'xpath' or element.path.count('>') > 2):
+        suggestion = suggest_css(matches[0], document)
+        if suggestion and suggestion != element.path:
+            row['suggestion'] = {'css': suggestion, 'time_us': round(measure(CSSSelector(suggestion), document), 1)}
+    return row
+
+
+def lint_page(yaml_path: Path) -> Tuple[List[dict], int]:
+    """
+    检查一个yaml文件的全部元素，没有快照时只检查定位方式与路径是否相符
+    :return: (各元素的检查结果, 快照数量)
+    """
+    snapshot_files = sorted((SNAPSHOT_DIR / yaml_path.stem).glob('*.html'))
+    snapshots = {f.stem: html.fromstring(f.read_bytes()).getroottree().getroot() for f in snapshot_files}
+    markers = yaml_markers(yaml_path)
+    elements = list(iter_elements(Page(yaml_path.name).load()))
+    parents = {element.chain_name: parent for element, parent in elements}
+    return [lint_element(element, parents, markers.get(element.chain_name, ''), snapshots) for element, _ in elements], len(snapshots)
+
+
+def print_report(page: str, rows: List[dict]):
+    print(f'== {page} ==')
+    for row in rows:
+        status = 'ERROR' if row['errors'] else 'WARN' if row['warnings'] else 'OK'
+        time_us = f"{row['time_us']:.1f}us" if row['time_us'] is not None else '-'
+        print(f"{status:<5} {row['element']:<55} {row['count']:>3} {time_us:>10}  {'; '.join(row['errors'] + row['warnings'])}")
+        if row['suggestion']:
+            print(f"{'':<5} {'':<55} 建议: {row['suggestion']['css']} ({row['suggestion']['time_us']:.1f}us)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='元素定位离线检查')
+    parser.add_argument('pages', nargs='*', help='yaml文件名（不含扩展名），默认全部')
+    parser.add_argument('--json', type=Path, default=ROOT / 'logs' / 'selector_lint.json', help='JSON报告路径')
+    parser.add_argument('--strict', action='store_true', help='页面没有快照时视为错误')
+    args = parser.parse_args()
+    # Page按HOME（项目根目录）查找元素文件
+    os.environ['HOME'] = str(ROOT)
+
+    report, failed = {}, False
+    for yaml_path in sorted(ELEMENTS_DIR.glob('*.yaml')):
+        if args.pages and yaml_path.stem not in args.pages:
+            continue
+        rows, snapshot_count = lint_page(yaml_path)
+        print_report(yaml_path.stem, rows)
+        if not snapshot_count:
+            level = 'ERROR' if args.strict else 'WARN'
+            print(f'{level:<5} 未找到快照：{SNAPSHOT_DIR / yaml_path.stem}/*.html，只检查了定位方式与路径，未检查匹配情况')
+            failed = failed or args.strict
+        report[yaml_path.stem] = {'snapshots': snapshot_count, 'elements': rows}
+        failed = failed or any(row['errors'] for row in rows)
+    args.json.parent.mkdir(parents=True, exist_ok=True)
+    args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,164 @@
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Union
+
+from selenium.common import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+
+from base.element import Element
+from common import Config, LogUtils
+
+
+@lru_cache(maxsize=None)
+def wait_engine_name() -> str:
+    """
+    等待引擎名称，配置文件config.ini [locator] wait_engine：polling（WebDriverWait轮询）或observer（页面内事件驱动）
+    """
+    return Config.getini('locator', 'wait_engine')
+
+
+def get_wait_engine(driver: WebDriver) -> Union['PollingWait', 'ObserverWait']:
+    """
+    按配置获取等待引擎
+    """
+    return ObserverWait(driver) if wait_engine_name() == 'observer' else PollingWait(driver)
+
+
+class PollingWait:
+    """
+    轮询等待引擎，基于WebDriverWait，每0.5秒通过HTTP检查一次条件
+    条件名称与expected_conditions一致，可通过register扩展
+    """
+    conditions: Dict[str, Callable] = {
+        'presence_of_element_located': lambda locator, arg: EC.presence_of_element_located(locator),
+        'presence_of_all_elements_located': lambda locator, arg: EC.presence_of_all_elements_located(locator),
+        'visibility_of_element_located': lambda locator, arg: EC.visibility_of_element_located(locator),
+        'invisibility_of_element_located': lambda locator, arg: EC.invisibility_of_element_located(locator),
+        'element_to_be_clickable': lambda locator, arg: EC.element_to_be_clickable(locator),
+        'text_to_be_present_in_element': lambda locator, arg: EC.text_to_be_present_in_element(locator, arg),
+        'document_ready': lambda locator, arg: lambda driver: driver.execute_script("return document.readyState") == "complete",
+    }
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    @classmethod
+    def register(cls, name: str, factory: Callable):
+        """
+        注册条件
+        :param name: 条件名称
+        :param factory: (定位元组, 参数) -> WebDriverWait可用的条件
+        """
+        cls.conditions[name] = factory
+
+    def until(self, condition: str, element: Optional[Element] = None, root: Optional[WebElement] = None, arg=None, timeout: float = 10,
+              poll: float = 0.5):
+        """
+        等待条件成立
+        :param condition: 条件名称
+        :param element: 元素，document_ready等页面级条件可为空
+        :param root: 定位上下文（父元素），为空时在整个页面中定位
+        :param arg: 条件参数，如text_to_be_present_in_element的文本
+        :param timeout: 超时时间（秒）
+        :param poll: 轮询间隔（秒）
+        :return: 条件结果
+        """
+        locator = (element.method, element.path) if element else None
+        return WebDriverWait(root or self.driver, timeout, poll_frequency=poll).until(self.conditions[condition](locator, arg))
+
+
+class ObserverWait:
+    """
+    事件驱动等待引擎，通过execute_async_script在页面内安装MutationObserver和requestAnimationFrame监听，
+    条件成立时立即返回，等待期间不产生额外的HTTP轮询
+    条件为JS函数体，参数为(nodes: 当前匹配的元素数组, arg: 条件参数)，返回非空值即视为成立，可通过register扩展
+    """
+    conditions: Dict[str, str] = {
+        'presence_of_element_located': "return nodes[0];",
+        'presence_of_all_elements_located': "return nodes.length ? nodes : null;",
+        'visibility_of_element_located': "return nodes.find(visible);",
+        'invisibility_of_element_located': "return nodes.some(visible) ? null : true;",
+        'element_to_be_clickable': "return nodes.find(e => visible(e) && !e.disabled);",
+        'text_to_be_present_in_element': "return nodes[0] && nodes[0].innerText.includes(arg) ? true : null;",
+        'document_ready': "return document.readyState === 'complete' ? true : null;",
+    }
+    _wait_js = """
+        const [root, method, path, arg, timeout, done] = arguments;
+        const visible = (e) => !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length)
+            && getComputedStyle(e).visibility !== 'hidden';
+        const query = () => {
+            if (!path) return [];
+            if (method === 'xpath') {
+                const result = document.evaluate(path, root || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                return Array.from({length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+            }
+            return Array.from((root || document).querySelectorAll(path));
+        };
+        const check = (nodes, arg) => { %s };
+        const evaluate = () => {
+            try {
+                const result = check(query(), arg);
+                return result === undefined || result === false ? null : result;
+            } catch (e) {
+                return null;
+            }
+        };
+        let finished = false, frame = 0, timer = 0, observer = null;
+        const finish = (value) => {
+            if (finished) return;
+            finished = true;
+            if (observer) observer.disconnect();
+            cancelAnimationFrame(frame);
+            clearTimeout(timer);
+            done(value);
+        };
+        const first = evaluate();
+        if (first !== null) return finish(first);
+        observer = new MutationObserver(() => { const r = evaluate(); if (r !== null) finish(r); });
+        observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+        // 样式、布局变化不一定产生DOM变更，逐帧补充检查
+        const tick = () => { const r = evaluate(); if (r !== null) return finish(r); frame = requestAnimationFrame(tick); };
+        frame = requestAnimationFrame(tick);
+        timer = setTimeout(() => finish(null), timeout);
+    """
+    # 已设置的脚本超时：{driver的session_id: 秒}
+    _script_timeouts: Dict[str, float] = {}
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    @classmethod
+    def register(cls, name: str, script: str):
+        """
+        注册条件
+        :param name: 条件名称
+        :param script: JS函数体，参数为(nodes, arg)，可使用visible(e)判断可见性
+        """
+        cls.conditions[name] = script
+
+    def _ensure_script_timeout(self, timeout: float):
+        """
+        脚本超时需大于等待超时，否则驱动会先于页面内计时器中断脚本
+        """
+        script_timeout = timeout + 5
+        if self._script_timeouts.get(self.driver.session_id, 0) < script_timeout:
+            self.driver.set_script_timeout(script_timeout)
+            self._script_timeouts[self.driver.session_id] = script_timeout
+
+    def until(self, condition: str, element: Optional[Element] = None, root: Optional[WebElement] = None, arg=None, timeout: float = 10,
+              poll: float = 0.5):
+        """
+        等待条件成立，参数同PollingWait.until，事件驱动无需轮询，poll不生效
+        """
+        self._ensure_script_timeout(timeout)
+        script = self._wait_js % self.conditions[condition]
+        result = self.driver.execute_async_script(
+            script, root, element.method if element else None, element.path if element else None, arg, int(timeout * 1000)
+        )
+        if result is None:
+            error_log = f'等待超时({timeout}s): {condition} {element.path if element else ""}'
+            LogUtils().debug(error_log)
+            raise TimeoutException(error_log)
+        return result
@@ -1,8 +1,13 @@
+import hashlib
+import json
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 from typing import List
 
+from ruamel.yaml import YAML
 from selenium.common.exceptions import NoSuchDriverException
 from selenium.webdriver import DesiredCapabilities
 from selenium.webdriver.chrome.options import Options
@@ -12,15 +17,24 @@ from selenium.webdriver.chromium.webdriver import ChromiumDriver
 from selenium.webdriver.common.driver_finder import DriverFinder
 from selenium.webdriver.common.options import ArgOptions, BaseOptions
 from selenium.webdriver.common.selenium_manager import SeleniumManager
+from selenium.webdriver.remote import utils
+
+from base.profile_template import ProfileTemplate
+from common.config_loader import Config
+from common.metrics import CommandMetrics
 
 logger = logging.getLogger(__name__)
 
 # 核心代码介绍：
 # 1. 定义MySeleniumManager类，继承SeleniumManager类，重写binary_paths方法，使用MySeleniumManager类代替SeleniumManager类。
 # 2. 定义MyDriverFinder类，继承DriverFinder类，重写_binary_paths方法，使用MySeleniumManager类代替SeleniumManager类。
-# 3. 定义MyChromiumDriver类，继承ChromiumDriver类，重写__init__方法，使用MyDriverFinder类代替DriverFinder类。
-# 4. 定义WebDriver类，继承MyChromiumDriver类，重写__init__方法，使用chrome浏览器。
-# 5. 调用WebDriver类，创建chrome浏览器实例。
+# 3. 定义BinaryPathCache类，将selenium-manager解析出的驱动/浏览器路径持久化到磁盘，命中时不再启动selenium-manager子进程。
+# 4. 定义MyChromiumDriver类，继承ChromiumDriver类，重写__init__方法，使用MyDriverFinder类代替DriverFinder类。
+# 5. 定义LaunchProfile类，从config/launch_profile.yaml加载启动配置（启动参数、偏好设置、屏蔽地址）。
+# 6. 定义InstrumentedRemoteConnection类，继承ChromiumRemoteConnection类，记录每条命令的耗时和请求/响应大小。
+# 7. 定义WebDriver类，继承MyChromiumDriver类，重写__init__方法，使用chrome浏览器并应用启动配置，
+#    启动配置开启profile_template时从预热的用户数据目录模板复制一份独立目录，关闭时删除。
+# 8. 调用WebDriver类，创建chrome浏览器实例。
 
 # 代码实现：
 class MySeleniumManager(SeleniumManager):
@@ -71,6 +85,75 @@ class MySeleniumManager(SeleniumManager):
         return self._run(args)
 
 
+class BinaryPathCache:
+    """
+    selenium-manager解析结果的磁盘缓存
+    缓存键由selenium-manager参数和所有SE_*环境变量组成，有效期取SE_TTL（秒），
+    命中时只校验文件是否存在以及大小、修改时间是否变化（浏览器/驱动升级会替换文件），不启动子进程。
+    缓存文件：SE_CACHE_PATH/binary_paths.json
+    """
+    _lock = threading.Lock()
+
+    def __init__(self):
+        cache_dir = os.getenv("SE_CACHE_PATH") or Path.home() / ".cache" / "selenium"
+        self.cache_file = Path(cache_dir) / "binary_paths.json"
+        self.ttl = int(os.getenv("SE_TTL") or 3600)
+
+    @staticmethod
+    def _key(args: List) -> str:
+        env = {k: v for k, v in os.environ.items() if k.startswith("SE_")}
+        raw = json.dumps({"args": args, "env": env}, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _stat(path: str) -> List:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime]
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, args: List) -> dict:
+        """
+        读取缓存的驱动/浏览器路径，未命中、过期或文件已变化时返回None
+        """
+        entry = self._read().get(self._key(args))
+        if not entry or time.time() - entry["created"] > self.ttl:
+            return None
+        try:
+            for name in ("driver_path", "browser_path"):
+                if self._stat(entry[name]) != entry["stat"][name]:
+                    return None
+        except OSError:
+            return None
+        logger.debug("Selenium Manager cache hit: %s", entry)
+        return {"driver_path": entry["driver_path"], "browser_path": entry["browser_path"]}
+
+    def put(self, args: List, output: dict) -> None:
+        """
+        写入selenium-manager解析结果，先写临时文件再替换，避免并发进程读到半个文件
+        """
+        try:
+            entry = {
+                "driver_path": output["driver_path"],
+                "browser_path": output["browser_path"],
+                "stat": {name: self._stat(output[name]) for name in ("driver_path", "browser_path")},
+                "created": time.time(),
+            }
+            with self._lock:
+                data = self._read()
+                data[self._key(args)] = entry
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Failed to write Selenium Manager cache %s: %s", self.cache_file, e)
+
+
 class MyDriverFinder(DriverFinder):
     def __init__(self, service: Service, options: BaseOptions) -> None:
         super().__init__(service, options)
@@ -90,7 +173,13 @@ class MyDriverFinder(DriverFinder):
                     raise ValueError(f"The path is not a valid file: {path}")
                 self._paths["driver_path"] = path
             else:
-                output = MySeleniumManager().binary_paths(self._to_args())
+                # 修改的部分：优先读取磁盘缓存，未命中时才启动selenium-manager
+                args = self._to_args()
+                cache = BinaryPathCache()
+                output = cache.get(args)
+                if not output:
+                    output = MySeleniumManager().binary_paths(args)
+                    cache.put(args, output)
                 if Path(output["driver_path"]).is_file():
                     self._paths["driver_path"] = output["driver_path"]
                 else:
@@ -105,6 +194,82 @@ class MyDriverFinder(DriverFinder):
         return self._paths
 
 
+class LaunchProfile:
+    """
+    浏览器启动配置
+    配置文件：config/launch_profile.yaml，通过环境变量LAUNCH_PROFILE（env/se-config.env）选择，
+    包含Chrome启动参数arguments、偏好设置prefs、CDP屏蔽地址blocked_urls，
+    以及是否开启性能日志performance_log（网络空闲检测依赖该日志中的Network事件）、
+    是否使用用户数据目录模板profile_template（模板通过python -m base.profile_template构建）。
+    """
+    profile_path = Path(__file__).resolve().parents[1] / "config" / "launch_profile.yaml"
+
+    def __init__(self, name: str = None):
+        self.name = name or os.getenv("LAUNCH_PROFILE")
+        profile = {}
+        if self.name:
+            with open(self.profile_path, "r", encoding="utf-8") as f:
+                profiles = YAML(typ="safe").load(f) or {}
+            if self.name not in profiles:
+                raise ValueError(f"Launch profile {self.name} not found in {self.profile_path}")
+            profile = profiles[self.name] or {}
+        self.arguments: List[str] = profile.get("arguments") or []
+        self.prefs: dict = profile.get("prefs") or {}
+        self.blocked_urls: List[str] = profile.get("blocked_urls") or []
+        performance_log = profile.get("performance_log")
+        if performance_log == "auto":
+            # 只有默认页面就绪判断方式为网络空闲时才需要性能日志，避免每次跳转都读取日志
+            performance_log = Config.getini("locator", "page_load_mode") == "network_idle"
+        self.performance_log: bool = bool(performance_log)
+        self.profile_template: bool = bool(profile.get("profile_template"))
+
+    def apply_options(self, options: Options) -> Options:
+        """
+        将启动参数和偏好设置写入Options
+        """
+        for argument in self.arguments:
+            if argument not in options.arguments:
+                options.add_argument(argument)
+        if self.prefs:
+            prefs = options.experimental_options.get("prefs", {})
+            prefs.update(self.prefs)
+            options.add_experimental_option("prefs", prefs)
+        if self.performance_log:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        return options
+
+    def apply_driver(self, driver: ChromiumDriver) -> None:
+        """
+        浏览器启动后应用需要CDP下发的配置
+        """
+        if self.blocked_urls:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+        logger.debug("Launch profile %s applied", self.name)
+
+
+class InstrumentedRemoteConnection(ChromiumRemoteConnection):
+    """
+    记录命令耗时的连接，通过环境变量COMMAND_METRICS=true（env/se-config.env）开启，
+    统计结果由CommandMetrics在测试结束时导出
+    """
+    _local = threading.local()
+
+    def execute(self, command, params):
+        start = time.perf_counter()
+        self._local.request_bytes = 0
+        response = super().execute(command, params)
+        duration = time.perf_counter() - start
+        response_bytes = len(utils.dump_json(response.get("value"))) if response else 0
+        CommandMetrics().record(command, duration, self._local.request_bytes, response_bytes)
+        return response
+
+    def _request(self, method, url, body=None):
+        self._local.request_bytes = len(body) if body else 0
+        return super()._request(method, url, body=body)
+
+
 class MyChromiumDriver(ChromiumDriver):
     """Controls the WebDriver instance of ChromiumDriver and allows you to
     drive the browser."""
@@ -137,7 +302,9 @@ class MyChromiumDriver(ChromiumDriver):
         self.service.path = self.service.env_path() or finder.get_driver_path()
         self.service.start()
 
-        executor = ChromiumRemoteConnection(
+        # 修改的部分：开启命令统计时使用InstrumentedRemoteConnection
+        connection = InstrumentedRemoteConnection if os.getenv("COMMAND_METRICS", "").lower() == "true" else ChromiumRemoteConnection
+        executor = connection(
             remote_server_addr=self.service.service_url,
             browser_name=browser_name,
             vendor_prefix=vendor_prefix,
@@ -163,6 +330,7 @@ class WebDriver(MyChromiumDriver):
             options: Options = None,
             service: Service = None,
             keep_alive: bool = True,
+            profile: str = None,
     ) -> None:
         """Creates a new instance of the chrome driver. Starts the service and
         then creates new instance of chrome driver.
@@ -171,14 +339,45 @@ class WebDriver(MyChromiumDriver):
          - options - this takes an instance of ChromeOptions
          - service - Service object for handling the browser driver if you need to pass extra details
          - keep_alive - Whether to configure ChromeRemoteConnection to use HTTP keep-alive.
+         - profile - Launch profile name in config/launch_profile.yaml, defaults to env LAUNCH_PROFILE.
         """
         service = service if service else Service()
         options = options if options else Options()
+        # 修改的部分：应用启动配置
+        self.profile = LaunchProfile(profile)
+        self.profile.apply_options(options)
+        # 修改的部分：从用户数据目录模板复制，已指定--user-data-dir（如构建模板时）则不复制
+        self.user_data_dir = None
+        if self.profile.profile_template and not any(arg.startswith("--user-data-dir") for arg in options.arguments):
+            template = ProfileTemplate()
+            if template.exists:
+                self.user_data_dir = template.clone()
+                options.add_argument(f"--user-data-dir={self.user_data_dir}")
+            else:
+                logger.warning("Profile template %s not built, starting with an empty profile", template.template_dir)
 
-        super().__init__(
-            browser_name=DesiredCapabilities.CHROME["browserName"],
-            vendor_prefix="goog",
-            options=options,
-            service=service,
-            keep_alive=keep_alive,
-        )
+        try:
+            super().__init__(
+                browser_name=DesiredCapabilities.CHROME["browserName"],
+                vendor_prefix="goog",
+                options=options,
+                service=service,
+                keep_alive=keep_alive,
+            )
+        except Exception:
+            # 修改的部分：浏览器或驱动启动失败时quit()不会被调用，删除复制出的用户数据目录
+            if self.user_data_dir:
+                ProfileTemplate.cleanup(self.user_data_dir)
+                self.user_data_dir = None
+            raise
+        self.profile.apply_driver(self)
+
+    def quit(self) -> None:
+        """Closes the browser and shuts down the ChromiumDriver executable,
+        then removes the user data dir cloned from the profile template."""
+        try:
+            super().quit()
+        finally:
+            if getattr(self, "user_data_dir", None):
+                ProfileTemplate.cleanup(self.user_data_dir)
+                self.user_data_dir = None
@@ -0,0 +1,71 @@
+"""
+Page()单次创建耗时基准测试
+对比旧实现（inspect.stack()获取调用方文件 + ruamel往返模式解析yaml）与当前实现（Page.bind绑定/sys._getframe + PageRegistry共享元素树），
+并用递归调用模拟pytest较深的调用栈。
+运行：python benchmark/bench_page_init.py
+"""
+import inspect
+import os
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ['HOME'] = str(ROOT)
+os.environ.setdefault('CONFIG_PATH', str(ROOT / 'config' / 'config.ini'))
+
+from ruamel.yaml import YAML  # noqa: E402
+
+from base.element import Page  # noqa: E402
+
+YAML_NAME = 'home_page.yaml'
+NUMBER = 200
+
+
+def old_page():
+    """旧实现的主要开销：inspect.stack()和往返模式解析"""
+    caller_file = inspect.stack()[1].filename
+    yaml_path = ROOT / 'page_object' / 'elements' / (YAML_NAME or Path(caller_file).stem + '.yaml')
+    with open(yaml_path, 'r', encoding='utf-8') as f:
+        return YAML().load(f)
+
+
+def new_page():
+    return Page(YAML_NAME).load()
+
+
+def new_page_inferred():
+    """未指定文件名时按调用方推断（sys._getframe）"""
+    Page._bindings[__name__] = YAML_NAME
+    return Page().load()
+
+
+def stack_caller():
+    """只获取调用方文件：旧实现"""
+    return inspect.stack()[1].filename
+
+
+def getframe_caller():
+    """只获取调用方文件：当前实现的推断方式"""
+    return sys._getframe(1).f_code.co_filename
+
+
+def at_depth(depth: int, func):
+    """在指定深度的调用栈中执行"""
+    if depth:
+        return at_depth(depth - 1, func)
+    return func()
+
+
+def bench(func, depth: int) -> float:
+    """单次耗时（微秒）"""
+    return timeit.timeit(lambda: at_depth(depth, func), number=NUMBER) / NUMBER * 1e6
+
+
+if __name__ == '__main__':
+    new_page()  # 预热：编译元素文件
+    print(f'{"depth":>6} {"before(us)":>12} {"after(us)":>12} {"inferred(us)":>13} {"inspect.stack(us)":>18} {"_getframe(us)":>14}')
+    for depth in (0, 50, 150):
+        print(f'{depth:>6} {bench(old_page, depth):>12.1f} {bench(new_page, depth):>12.1f} {bench(new_page_inferred, depth):>13.1f} '
+              f'{bench(stack_caller, depth):>18.1f} {bench(getframe_caller, depth):>14.1f}')
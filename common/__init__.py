@@ -1,6 +1,7 @@
 from common.config_loader import Config
 from common.data_loader import Excel, PublicData
 from common.env_loader import Env
-from common.fixture import singleton
+from common.fixture import singleton, driver_singleton, release_driver
 from common.log import LogUtils
+from common.metrics import CommandMetrics
 from common.generate_order import generate_execution_order
\ No newline at end of file
@@ -1,3 +1,7 @@
+import threading
+from typing import Dict
+
+
 # 单例类装饰器
 def singleton(cls):
     """
@@ -16,3 +20,41 @@ def singleton(cls):
         return instances[cls]
 
     return get_instance
+
+
+# 按驱动区分的实例：{类: {驱动: 实例}}，驱动关闭时通过release_driver释放
+_driver_instances: Dict[type, dict] = {}
+_driver_instances_lock = threading.Lock()
+
+
+# 按驱动区分的单例类装饰器
+def driver_singleton(cls):
+    """
+    按驱动区分的单例类装饰器，用于绑定驱动的页面对象
+    不传driver时与singleton相同（使用全局Driver）；传入driver（如驱动池租借的驱动）时每个驱动各自保持单例，
+    实例持有驱动的引用，驱动关闭时需调用release_driver释放（DriverPool关闭驱动时自动调用）
+    :param cls: 类，构造参数只有driver
+    :return: 单例类
+    """
+    default = singleton(cls)
+    instances = _driver_instances.setdefault(cls, {})
+
+    def get_instance(driver=None):
+        if driver is None:
+            return default()
+        with _driver_instances_lock:
+            if driver not in instances:
+                instances[driver] = cls(driver)
+            return instances[driver]
+
+    return get_instance
+
+
+def release_driver(driver):
+    """
+    释放驱动对应的全部页面对象实例
+    :param driver: 驱动
+    """
+    with _driver_instances_lock:
+        for instances in _driver_instances.values():
+            instances.pop(driver, None)
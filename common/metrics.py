@@ -0,0 +1,171 @@
+import json
+import os
+import sys
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Tuple
+
+from common.fixture import singleton
+from common.log import LogUtils, LogConfig
+
+# 项目根目录，用于判断调用栈中的帧是否属于本项目
+PROJECT_HOME = Path(__file__).resolve().parents[1]
+BASE_DIR = str(PROJECT_HOME / 'base')
+COMMON_DIR = str(PROJECT_HOME / 'common')
+
+
+class Histogram:
+    """
+    累积直方图，桶边界为上界（含），最后一个桶为+Inf
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list:
+        """
+        返回[(桶上界, 累计数量)]，上界为'+Inf'的桶数量等于count
+        """
+        result, total = [], 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'sum': self.sum, 'buckets': {str(k): v for k, v in self.cumulative()}}
+
+
+@singleton
+class CommandMetrics:
+    """
+    WebDriver命令耗时统计
+    按(命令, Locator动作, 页面对象/测试方法, 测试用例)记录每条W3C命令的耗时和请求/响应大小直方图，
+    测试结束时导出为JSON和OpenMetrics文本。
+    """
+    duration_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    payload_buckets = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+    label_names = ('command', 'action', 'caller', 'test')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration: Dict[tuple, Histogram] = defaultdict(lambda: Histogram(self.duration_buckets))
+        self.request_bytes: Dict[tuple, Histogram] = defaultdict(lambda: Histogram(self.payload_buckets))
+        self.response_bytes: Dict[tuple, Histogram] = defaultdict(lambda: Histogram(self.payload_buckets))
+
+    @staticmethod
+    def _qualname(frame) -> str:
+        """
+        帧对应函数的限定名；co_qualname在Python 3.11才加入，低版本按self/cls补上类名
+        """
+        code = frame.f_code
+        if hasattr(code, 'co_qualname'):
+            return code.co_qualname
+        owner = frame.f_locals.get('self', frame.f_locals.get('cls'))
+        if owner is None:
+            return code.co_name
+        owner_class = owner if isinstance(owner, type) else type(owner)
+        return f'{owner_class.__qualname__}.{code.co_name}'
+
+    @staticmethod
+    def caller() -> Tuple[str, str]:
+        """
+        从调用栈获取发起命令的Locator动作和页面对象/测试方法
+        :return: (Locator等base层方法名, 页面对象或测试方法的限定名)
+        """
+        action, caller = '', ''
+        frame = sys._getframe(1)
+        home = str(PROJECT_HOME)
+        while frame:
+            filename = frame.f_code.co_filename
+            if filename.startswith(home):
+                if filename.startswith(BASE_DIR):
+                    action = action or frame.f_code.co_name
+                elif not filename.startswith(COMMON_DIR):
+                    caller = CommandMetrics._qualname(frame)
+                    break
+            frame = frame.f_back
+        return action, caller
+
+    def record(self, command: str, duration: float, request_bytes: int, response_bytes: int):
+        """
+        记录一条命令
+        :param command: W3C命令名称
+        :param duration: 耗时（秒）
+        :param request_bytes: 请求体大小
+        :param response_bytes: 响应体大小
+        """
+        action, caller = self.caller()
+        test = os.getenv('PYTEST_CURRENT_TEST', '').rsplit(' ', 1)[0]
+        key = (command, action, caller, test)
+        with self._lock:
+            self.duration[key].observe(duration)
+            self.request_bytes[key].observe(request_bytes)
+            self.response_bytes[key].observe(response_bytes)
+
+    def to_json(self) -> list:
+        """
+        导出为JSON结构
+        """
+        with self._lock:
+            return [
+                {
+                    **dict(zip(self.label_names, key)),
+                    'duration_seconds': histogram.to_dict(),
+                    'request_bytes': self.request_bytes[key].to_dict(),
+                    'response_bytes': self.response_bytes[key].to_dict(),
+                }
+                for key, histogram in self.duration.items()
+            ]
+
+    def to_openmetrics(self) -> str:
+        """
+        导出为OpenMetrics文本格式
+        """
+        lines = []
+        metrics = (
+            ('webdriver_command_duration_seconds', 'WebDriver command latency', self.duration),
+            ('webdriver_command_request_bytes', 'WebDriver command request payload size', self.request_bytes),
+            ('webdriver_command_response_bytes', 'WebDriver command response payload size', self.response_bytes),
+        )
+        with self._lock:
+            for name, help_text, histograms in metrics:
+                lines.append(f'# TYPE {name} histogram')
+                lines.append(f'# HELP {name} {help_text}.')
+                for key, histogram in histograms.items():
+                    labels = ','.join(f'{k}={json.dumps(v, ensure_ascii=False)}' for k, v in zip(self.label_names, key))
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, output_dir: Path = None):
+        """
+        写出command_metrics.json和command_metrics.txt（OpenMetrics），默认输出到日志目录
+        """
+        if not self.duration:
+            return
+        output_dir = Path(output_dir or LogConfig.home / LogConfig.get_config('log_path'))
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            (output_dir / 'command_metrics.json').write_text(json.dumps(self.to_json(), ensure_ascii=False, indent=2), encoding='utf-8')
+            (output_dir / 'command_metrics.txt').write_text(self.to_openmetrics(), encoding='utf-8')
+            LogUtils().debug(f'WebDriver命令统计已导出到{output_dir}')
+        except Exception as e:
+            LogUtils().errors(f'WebDriver命令统计导出失败！{e}')
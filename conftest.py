@@ -3,12 +3,19 @@ from pathlib import Path
 
 import pytest
 
-from base import Driver
-from common import Excel, LogUtils, Env, Config, PublicData, generate_execution_order
+from base import Driver, DriverPool
+from base.adaptive_timeout import TimeoutHistory
+from base.browser_state import BrowserState
+from base.driver import start_driver_async
+from base.har import HarInterceptor
+from base.preflight import Preflight
+from common import Excel, LogUtils, Env, Config, PublicData, generate_execution_order, CommandMetrics
+from page_object import Index
 
 all_test_data: [dict] = {}
 data_length: [defaultdict] = {}
-order_fullpath = generate_execution_order()
+# 测试执行顺序，在pytest_configure中后台启动驱动后生成
+order_fullpath = None
 
 
 def pytest_addoption(parser):
@@ -22,8 +29,14 @@ def pytest_configure(config):
     LogUtils().debug("pytest_configure函数被调用，开始初始化配置项")
     global all_test_data
     global data_length
+    global order_fullpath
     # 检查环境变量
     Env().check_env()
+    # 后台启动驱动，与测试收集、数据加载并行
+    if not config.option.collectonly:
+        start_driver_async()
+    # 生成测试执行顺序，与驱动启动并行
+    order_fullpath = generate_execution_order()
 
     # 将pytest.ini中的log_file参数设置为绝对路径
     rootdir = config.rootdir
@@ -58,6 +71,11 @@ def pytest_configure(config):
         "markers",
         "dependency(name=None, depends=[]): mark a test to be used as a dependency for other tests or to depend on other tests."
     )
+    # 页面元素预检
+    config.addinivalue_line(
+        "markers",
+        "preflight(yaml_name, *elements, frame=None): check that the required page elements exist before the test is called."
+    )
 
 
 # 显式声明data
@@ -191,8 +209,75 @@ def pytest_collection_modifyitems(config, items):
 @pytest.fixture(scope="class", autouse=True)
 def session_load():
     LogUtils().debug("session_load fixture被调用，开始加载session")
-    # 加载session
-    Driver().sessionManger.load_session("login")
+    # 加载session，浏览器已登录且未过期时跳过；session不存在或已过期时重新登录并保存
+    Driver().sessionManger.ensure_session("login", relogin=Index().login)
+
+
+# 从驱动池租借驱动，测试类结束后重置并归还
+@pytest.fixture(scope="class")
+def pool_driver():
+    LogUtils().debug("pool_driver fixture被调用，开始租借驱动")
+    pool = DriverPool()
+    driver = pool.lease()
+    pool.session_manager(driver).ensure_session("login", relogin=Index(driver).login)
+    yield driver
+    pool.release(driver)
+
+
+# 后端接口录制/回放，每个测试用例对应一个HAR文件，每个驱动（全局驱动或驱动池租借的驱动）一个拦截器，config.ini [har] mode为off时不生效
+@pytest.fixture(scope="session")
+def har_interceptors():
+    interceptors = {}
+    yield interceptors
+    for interceptor in interceptors.values():
+        interceptor.stop()
+
+
+@pytest.fixture(autouse=True)
+def har(request, har_interceptors):
+    if Config.getini('har', 'mode') != 'off':
+        # 测试使用驱动池时拦截租借的驱动，否则拦截全局驱动
+        driver = request.getfixturevalue("pool_driver") if "pool_driver" in request.fixturenames else Driver().driver
+        interceptor = har_interceptors.get(driver.session_id)
+        if interceptor is not None and not interceptor.attached:
+            # 驱动归还驱动池时换用了新标签页，重新建立拦截
+            interceptor.stop()
+            interceptor = None
+        if interceptor is None:
+            interceptor = har_interceptors[driver.session_id] = HarInterceptor.from_config(driver)
+        har_path = HarInterceptor.har_path_for(request.node.nodeid)
+        if interceptor.har_path is None:
+            interceptor.start(har_path)
+        else:
+            interceptor.switch(har_path)
+    yield
+
+
+# 页面元素预检：在setup（含setup_method跳转页面）之后、测试调用之前，一次性检查preflight标记的必需元素，
+# 不存在时按config.ini [preflight] on_missing跳过或失败，不再等待每个元素定位超时
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("preflight")
+    if marker is None or not Config.getini('preflight', 'enabled', bool):
+        return
+    driver = item.funcargs.get("pool_driver") or Driver().driver
+    missing = Preflight(driver, marker.args[0], marker.kwargs.get("frame")).missing(marker.args[1:])
+    if missing:
+        message = f"预检失败，{marker.args[0]}中的必需元素不存在: {missing}"
+        LogUtils().errors(message)
+        if Config.getini('preflight', 'on_missing') == 'fail':
+            pytest.fail(message, pytrace=False)
+        pytest.skip(message)
+
+
+# 测试结束后导出WebDriver命令统计、保存元素定位耗时、输出元素缓存统计
+def pytest_sessionfinish(session):
+    LogUtils().debug("pytest_sessionfinish函数被调用，开始导出WebDriver命令统计")
+    CommandMetrics().export()
+    # 保存元素定位耗时历史，用于计算自适应超时
+    TimeoutHistory().save()
+    # 输出元素缓存命中统计
+    BrowserState.report()
 
 
 global cur_item
@@ -0,0 +1,44 @@
+# 由base.page_codegen根据page_object/elements/foundation.yaml生成，请勿手动修改
+from base.element import Element, PageNamespace
+
+SOURCE = 'foundation.yaml'
+SOURCE_SHA1 = 'f1ab2d09a8dd1c39c15f9d6cd0c68e6fbcfef10f'
+
+
+class page(PageNamespace):
+    __slots__ = ()
+    class software(PageNamespace):
+        __slots__ = ()
+        software_name = Element('css', '#root > div > div.container___2L9JH.theme0___11dSN > div.titlebar___GyWMy > div.title___2Meyb > span', chain_name='software.software_name')
+        software_name_pop = Element('xpath', '/html/body/div[2]/div/div[2]/div/div[2]/div/div/div[1]/span[2]', chain_name='software.software_name_pop')
+        software_name_input = Element('xpath', '/html/body/div[2]/div/div[2]/div/div[2]/div/div/div[1]/div/input', chain_name='software.software_name_input')
+        software_name_confirm = Element('xpath', '/html/body/div[2]/div/div[2]/div/div[2]/div/div/div[2]/button[2]/span', chain_name='software.software_name_confirm')
+        software_name_cancel = Element('xpath', '/html/body/div[2]/div/div[2]/div/div[2]/div/div/div[2]/button[1]/span', chain_name='software.software_name_cancel')
+    class user(PageNamespace):
+        __slots__ = ()
+        user = Element('xpath', '//*[@id="root"]/div/div[1]/div[1]/div[2]/div[3]/h5', chain_name='user.user')
+        modify_password = Element('xpath', '//html/body/div[3]/div/div/ul/li[1]/span/span[2]', chain_name='user.modify_password')
+        old_password_input = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div[1]/div/span/input', chain_name='user.old_password_input')
+        new_password_input = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div[2]/div/span', chain_name='user.new_password_input')
+        confirm_password_input = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div[4]/div/span', chain_name='user.confirm_password_input')
+        modify_password_confirm = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[3]/button[2]/span', chain_name='user.modify_password_confirm')
+        modify_password_cancel = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div[4]/div/span', chain_name='user.modify_password_cancel')
+        pop_tips = Element('xpath', '/html/body/div[4]/div/div/div/div/div/span[2]', chain_name='user.pop_tips')
+        password_format_tips = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div[3]/div/div/span', chain_name='user.password_format_tips')
+        logout = Element('xpath', '/html/body/div[2]/div/div/ul/li[3]/span/span[2]', chain_name='user.logout')
+    class _version_information(Element):
+        __slots__ = ()
+        version_number = Element('xpath', '/html/body/div[3]/div/div[2]/div/div[2]/div[2]/div/p[3]/text()', chain_name='version_information.version_number')
+    version_information = _version_information('xpath', '//*[@id="root"]/div/div[3]/div[3]/label[2]/span[2]', chain_name='version_information')
+    del _version_information
+    setting = Element('xpath', '//*[@id="root"]/div/div[1]/div[1]/div[2]/div[2]/span/svg', chain_name='setting')
+    class module(PageNamespace):
+        __slots__ = ()
+        items = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li', chain_name='module.items')
+        home = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="首页"]', chain_name='module.home')
+        map_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="地图管理"]', chain_name='module.map_manager')
+        IPC_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="相机管理"]', chain_name='module.IPC_manager')
+        device_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="设备管理"]', chain_name='module.device_manager')
+        person_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="人员管理"]', chain_name='module.person_manager')
+        alarm_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="报警管理"]', chain_name='module.alarm_manager')
+        algorithm_manager = Element('xpath', '//*[@id="root"]/div/div[1]/div[2]/div[1]/div/ul/li[@title="算法调试"]', chain_name='module.algorithm_manager')
@@ -0,0 +1,76 @@
+# 由base.page_codegen根据page_object/elements/home_page.yaml生成，请勿手动修改
+from base.element import Element, PageNamespace
+
+SOURCE = 'home_page.yaml'
+SOURCE_SHA1 = '6bda38b53a3ff39ec3b61d12aebe82d3f5f6f987'
+
+
+class page(PageNamespace):
+    __slots__ = ()
+    frame = Element('xpath', '//*[@id="common_frame"]/div/iframe', chain_name='frame')
+    class map_layer(PageNamespace):
+        __slots__ = ()
+        load_tip = Element('xpath', '//*[@id="root"]/div/div[1]/div/div[2]', chain_name='map_layer.load_tip')
+        first_layer = Element('xpath', '//*[@id="root"]/div/div[3]/div[1]/span', chain_name='map_layer.first_layer')
+        other_layers = Element('xpath', '//*[@id="root"]/div/div[3]/div[1]/div/div/div/ul/li', chain_name='map_layer.other_layers')
+    class track_mode(PageNamespace):
+        __slots__ = ()
+        real_time = Element('xpath', '//*[@id="root"]/div/div[3]/div[3]/label[1]/span[2]', chain_name='track_mode.real_time')
+        class _history(Element):
+            __slots__ = ()
+            class person_location(PageNamespace):
+                __slots__ = ()
+                in_area = Element('xpath', '//*[@id="root"]/div/div[3]/div/div/div[1]/div/div/div/label[1]/span[2]', chain_name='track_mode.history.person_location.in_area')
+                out_area = Element('xpath', '//*[@id="root"]/div/div[3]/div/div/div[1]/div/div/div/label[2]/span[2]', chain_name='track_mode.history.person_location.out_area')
+            class _person_type(Element):
+                __slots__ = ()
+                police = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[1]', chain_name='track_mode.history.person_type.police')
+                suspect = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[2]', chain_name='track_mode.history.person_type.suspect')
+                others = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[3]', chain_name='track_mode.history.person_type.others')
+            person_type = _person_type('xpath', '//*[@id="root"]/div/div[3]/div/div/div[1]/div/div/div/label[1]/span[1]', chain_name='track_mode.history.person_type')
+            del _person_type
+            search_input = Element('xpath', '//*[@id="root"]/div/div[3]/div/div/div[2]/div[1]/span/span/span[1]/input', chain_name='track_mode.history.search_input')
+            search = Element('xpath', '//*[@id="root"]/div/div[3]/div/div/div[2]/div[1]/span/span/span[2]/button', chain_name='track_mode.history.search')
+            class _search_result(Element):
+                __slots__ = ()
+                class person(PageNamespace):
+                    __slots__ = ()
+                    view = Element('xpath', '//ul/li/a', chain_name='track_mode.history.search_result.person.view')
+                    tracks = Element('xpath', '//*[@id="root"]/div/div[3]/div[2]/div/div/div[2]/div/div/div/div/div/div/div/table/tbody/tr', chain_name='track_mode.history.search_result.person.tracks')
+            search_result = _search_result('xpath', '//*[@id="root"]/div/div[3]/div/div/div[2]/div[2]/div/div/div/ul/li', chain_name='track_mode.history.search_result')
+            del _search_result
+            pages = Element('xpath', '/html/body/div/div/div[3]/div/div/div[2]/ul/li', chain_name='track_mode.history.pages')
+        history = _history('xpath', '//*[@id="root"]/div/div[3]/div[3]/label[2]/span[2]', chain_name='track_mode.history')
+        del _history
+        class _person_distribute(Element):
+            __slots__ = ()
+            class _person_type(Element):
+                __slots__ = ()
+                police = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[1]', chain_name='track_mode.person_distribute.person_type.police')
+                suspect = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[2]', chain_name='track_mode.person_distribute.person_type.suspect')
+                others = Element('xpath', '//*[@id="7c6b0f4d-1348-4a5a-c49f-8774e78b2398"]/ul/li[3]', chain_name='track_mode.person_distribute.person_type.others')
+            person_type = _person_type('xpath', '//*[@id="root"]/div/div[2]/div[1]/div/div/div/label[1]/span[1]', chain_name='track_mode.person_distribute.person_type')
+            del _person_type
+            class _person(Element):
+                __slots__ = ()
+                name = Element('xpath', '//h4/a', chain_name='track_mode.person_distribute.person.name')
+                trace = Element('xpath', '//ul/li/a', chain_name='track_mode.person_distribute.person.trace')
+                trace_tip = Element('xpath', '//*[@id="root"]/div/div[4]/div/span[1]', chain_name='track_mode.person_distribute.person.trace_tip')
+            person = _person('xpath', '//*[@id="root"]/div/div[2]/div[4]/div/div/div/div[2]/div/div[2]/div/div[2]/div/div/ul/li', chain_name='track_mode.person_distribute.person')
+            del _person
+        person_distribute = _person_distribute('xpath', '//*[@id="root"]/div/div[2]/div[1]', chain_name='track_mode.person_distribute')
+        del _person_distribute
+        class _device_list(Element):
+            __slots__ = ()
+            class _monitor(Element):
+                __slots__ = ()
+                class _device(Element):
+                    __slots__ = ()
+                    view = Element('xpath', '//ul/li/a', chain_name='track_mode.device_list.monitor.device.view')
+                device = _device('xpath', '//*[@id="root"]/div/div[2]/div[3]/div/div/div/div[2]/div/div[2]/div/div/div/div[2]/div/div/div/div/div/ul/li', chain_name='track_mode.device_list.monitor.device')
+                del _device
+            monitor = _monitor('xpath', '//*[@id="root"]/div/div[2]/div[3]/div/div/div/div[2]/div/div[2]/div/div/div/div[1]', chain_name='track_mode.device_list.monitor')
+            del _monitor
+            monitor_video = Element('xpath', '//*[@id="kmd-video-player"]', chain_name='track_mode.device_list.monitor_video')
+        device_list = _device_list('xpath', '//*[@id="root"]/div/div[2]/div[2]', chain_name='track_mode.device_list')
+        del _device_list
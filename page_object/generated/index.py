@@ -0,0 +1,13 @@
+# 由base.page_codegen根据page_object/elements/index.yaml生成，请勿手动修改
+from base.element import Element, PageNamespace
+
+SOURCE = 'index.yaml'
+SOURCE_SHA1 = 'd25508ac6085d4586d18ac69807fec18388dc6e2'
+
+
+class page(PageNamespace):
+    __slots__ = ()
+    user_text = Element('xpath', '//*[@id="login"]/div/span[1]/input', chain_name='user_text')
+    password_text = Element('css', '#login > div > span.ant-input-affix-wrapper.ant-input-password.input___3_OCv > input', chain_name='password_text')
+    confirm_button = Element('css', '#login > div > button', chain_name='confirm_button')
+    login_tip = Element('xpath', "//div[contains(@class,'ant-message-custom-content')]/span[2]", chain_name='login_tip')
@@ -1,16 +1,25 @@
+from typing import Type
+
 from base import Locator
 from base import Page
-from common import LogUtils, singleton
+from base.webdriver import WebDriver
+from common import LogUtils, driver_singleton
+from page_object.generated import foundation as elements
 
 
-@singleton
+@driver_singleton
+@Page.bind('foundation.yaml')
 class Foundation:
     """
     基础、通用、模块切换
     """
-    def __init__(self):
+    def __init__(self, driver: WebDriver = None):
+        """
+        :param driver: 绑定的驱动（如驱动池租借的驱动），为空时使用全局Driver
+        """
         # 首页
-        self.page = Page().load()
+        self.page: Type[elements.page] = Page().load()
+        self.driver = driver
 
     def get_version_info(self) -> str:
         """
@@ -18,14 +27,14 @@ class Foundation:
         :return: 版本信息
         """
         page = self.page
-        Locator(page.version_information).click()
-        return Locator(page.version_number).get_text()
+        Locator(page.version_information, driver=self.driver).click()
+        return Locator(page.version_number, driver=self.driver).get_text()
 
     def open_settings(self):
         """
         打开设置页面
         """
-        Locator(self.page.settings).click()
+        Locator(self.page.settings, driver=self.driver).click()
 
     def switch_module(self, module_name):
         """
@@ -33,20 +42,17 @@ class Foundation:
         """
         module_names = ["首页", "地图管理", "相机管理", "设备管理", "人员管理", "报警管理", "算法调试"]
         if module_name in module_names:
-            elements = self.page.module
-            for element in elements:
-                if module_name in elements.path:
-                    Locator(element).click()
-                    break
+            Locator(driver=self.driver).find_by_text(self.page.module.items, module_name).click()
         else:
             error_log = f"模块名称{module_name}不存在，请检查模块名称是否正确"
             LogUtils().errors(error_log)
             raise Exception(error_log)
 
     class SoftwareName:
-        def __init__(self):
+        def __init__(self, driver: WebDriver = None):
             # software模块
-            self.page = Page().load().software
+            self.page: Type[elements.page.software] = Page().load().software
+            self.driver = driver
 
         def modify_software_name(self, new_name):
             """
@@ -54,9 +60,9 @@ class Foundation:
             :param new_name:新平台名称
             """
             page = self.page
-            Locator(page.software_name).double_click()
-            Locator(page.software_name_input).input(new_name)
-            Locator(page.software_name_confirm).click()
+            Locator(page.software_name, driver=self.driver).double_click()
+            Locator(page.software_name_input, driver=self.driver).input(new_name)
+            Locator(page.software_name_confirm, driver=self.driver).click()
 
         def get_software_name(self) -> str:
             """
@@ -64,7 +70,7 @@ class Foundation:
             :return: 平台名称
             """
             page = self.page
-            return Locator(page.software_name).get_text()
+            return Locator(page.software_name, driver=self.driver).get_text()
 
         def restore_software_name(self):
             """
@@ -74,9 +80,10 @@ class Foundation:
             self.modify_software_name(original_name)
 
     class User:
-        def __init__(self):
+        def __init__(self, driver: WebDriver = None):
             # 用户模块
-            self.page = Page().load().user
+            self.page: Type[elements.page.user] = Page().load().user
+            self.driver = driver
 
         def change_password(self, old_password, new_password):
             """
@@ -84,29 +91,32 @@ class Foundation:
             :param old_password: 旧密码
             :param new_password: 新密码
             """
-            Locator(self.page.user).hover()
-            Locator(self.page.modify_password).click()
-            Locator(self.page.old_password_input).input(old_password)
-            Locator(self.page.new_password_input).input(new_password)
-            Locator(self.page.confirm_password_input).input(new_password)
-            Locator(self.page.confirm_password_change).click()
+            Locator(self.page.user, driver=self.driver).hover(until=self.page.modify_password)
+            Locator(self.page.modify_password, driver=self.driver).click(until=self.page.old_password_input)
+            # 弹窗内的输入和确定合并为一次操作调用
+            locator = Locator(driver=self.driver)
+            with locator.batch():
+                Locator(self.page.old_password_input, driver=self.driver).input(old_password)
+                Locator(self.page.new_password_input, driver=self.driver).input(new_password)
+                Locator(self.page.confirm_password_input, driver=self.driver).input(new_password)
+                Locator(self.page.modify_password_confirm, driver=self.driver).click()
 
         def get_password_tip(self) -> str:
             """
             获取密码弹窗提示信息
             :return: 密码弹窗提示信息
             """
-            return Locator(self.page.pop_tips).get_text()
+            return Locator(self.page.pop_tips, driver=self.driver).get_text()
 
         def get_password_format_tip(self) -> str:
             """
             获取密码格式提示
             :return: 密码格式提示
             """
-            return Locator(self.page.password_format_tip).get_text()
+            return Locator(self.page.password_format_tip, driver=self.driver).get_text()
 
         def logout(self):
             """
             退出登录
             """
-            Locator(self.page.logout).click()
+            Locator(self.page.logout, driver=self.driver).click()
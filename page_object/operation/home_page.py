@@ -1,42 +1,46 @@
-from typing import Literal
+from typing import Literal, Type
 
 from selenium.webdriver.common.by import By
 
 from base import Page, Locator
-from common import LogUtils, singleton
+from base.webdriver import WebDriver
+from common import LogUtils, driver_singleton
+from page_object.generated import home_page as elements
 from page_object.operation.foundation import Foundation
 
 
-@singleton
+@driver_singleton
+@Page.bind('home_page.yaml')
 class HomePage:
     """
     首页
     """
 
-    def __init__(self):
-        self.page = Page().load()
-        self.locator = Locator()
+    def __init__(self, driver: WebDriver = None):
+        """
+        :param driver: 绑定的驱动（如驱动池租借的驱动），为空时使用全局Driver
+        """
+        self.page: Type[elements.page] = Page().load()
+        self.locator = Locator(driver=driver)
 
-    def go_main(self):
-        self.locator.goto('/index.html#/svmsweb_jg/bdms/map')
+    def go_main(self, wait_mode: Literal['ready_state', 'network_idle'] = None, force: bool = False):
+        """
+        进入首页，浏览器已位于首页时不再重新加载
+        :param wait_mode: 页面就绪判断方式，见Locator.wait_for_page_load
+        :param force: 是否强制重新加载
+        """
+        self.locator.goto('/index.html#/svmsweb_jg/bdms/map', wait_mode, force)
         # 开始切换内部iframe，并统一使用定位器
         self.locator.load_element(self.page.frame).switch_frame()
 
     # 切换图层
     def switch_layer(self, layer_name):
-        self.locator.load_element(self.page.map_layer.first_layer)
-        if self.locator.get_text() != layer_name:
-            self.locator.hover()
-            web_elements = self.locator.load_elements(self.page.map_layer.other_layers)
-            flag = False
-            for index, web_element in enumerate(web_elements):
-                self.locator.path = self.page.map_layer.other_layers.path + f'[{index}]'
-                self.locator.web_element = web_element
-                if self.locator.get_text() == layer_name:
-                    self.locator.click()
-                    flag = True
-                    break
-            if not flag:
+        first_layer = self.locator.load_element(self.page.map_layer.first_layer)
+        if first_layer.get_text() != layer_name:
+            first_layer.hover(until=self.page.map_layer.other_layers)
+            try:
+                self.locator.find_by_text(self.page.map_layer.other_layers, layer_name).click()
+            except Exception:
                 error_log = f"切换图层失败，图层名称：{layer_name} 不存在"
                 LogUtils().errors(error_log)
         else:
@@ -58,19 +62,17 @@ class HomePage:
         self.locator.load_element(self.page.track_mode.history.search_input).input(person_name)
         if person_type:
             type_dict = {'民警': 'police', '嫌疑人': 'suspect', '其他': 'others'}
-            self.locator.load_element(self.page.track_person.history.person_type + '.' + type_dict[person_type]).click()
+            self.locator.load_element(getattr(self.page.track_mode.history.person_type, type_dict[person_type])).click()
         self.locator.load_element(self.page.track_mode.history.search).click()
-        self.locator.load_elements(self.page.track_mode.history.search_result)[0].load_element(self.page.track_mode.search_result.view)
+        self.locator.load_elements(self.page.track_mode.history.search_result)[0].load_element(
+            self.page.track_mode.history.search_result.person.view).web_element
 
     # 实时跟踪
     def real_track(self, person_name: str):
         self.locator.load_element(self.page.track_mode.real_time).click()
         self.locator.load_element(self.page.track_mode.person_distribute).click()
-        people = self.locator.load_elements(self.page.track_mode.person_distribute.person)
-        for person in people:
-            if person.load_element(self.page.track_mode.person_distribute.person.name).get_text() == person_name:
-                person.load_element(self.page.track_mode.person_distribute.person.trace).click()
-                break
+        person = self.page.track_mode.person_distribute.person
+        self.locator.find_by_text(person, person_name, child=person.trace, text_of=person.name).click()
 
     # 获取当前跟踪状态
     def get_track_status(self):
@@ -81,16 +83,14 @@ class HomePage:
     def view_device(self, device_name:str):
         self.locator.load_element(self.page.track_mode.device_list).click()
         self.locator.load_element(self.page.track_mode.device_list.monitor).click()
-        devices = self.locator.load_elements(self.page.track_mode.device_list.monitor.device)
-        for device in devices:
-            if device.get_text() == device_name:
-                device.load_element(self.page.track_mode.device_list.monitor.device.view)
-                break
+        device = self.page.track_mode.device_list.monitor.device
+        self.locator.find_by_text(device, device_name, child=device.view).click()
 
     # 判断设备视频是否打开
     def is_device_video_opened(self):
         try:
-            self.locator.load_element(self.page.track_mode.device_list.monitor_video)
+            # 定位器延迟定位，访问web_element时才会定位
+            self.locator.load_element(self.page.track_mode.device_list.monitor_video).web_element
             return True
         except Exception as e:
             return False
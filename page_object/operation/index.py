@@ -1,17 +1,29 @@
+import os
+from typing import Literal, Type
+
 from base import Locator
 from base import Page
-from common import singleton
+from base.webdriver import WebDriver
+from common import LogUtils, driver_singleton
+from page_object.generated import index as elements
 
 
-@singleton
+@driver_singleton
+@Page.bind('index.yaml')
 class Index:
-    def __init__(self):
-        self.page = Page().load()
-        self.locator = Locator()
+    def __init__(self, driver: WebDriver = None):
+        """
+        :param driver: 绑定的驱动（如驱动池租借的驱动），为空时使用全局Driver
+        """
+        self.page: Type[elements.page] = Page().load()
+        self.locator = Locator(driver=driver)
 
     # 启动首页
-    def launch_index(self):
-        self.locator.goto()
+    def launch_index(self, wait_mode: Literal['ready_state', 'network_idle'] = None):
+        """
+        :param wait_mode: 页面就绪判断方式，见Locator.wait_for_page_load
+        """
+        self.locator.goto(wait_mode=wait_mode)
 
     # 用户名输入
     def username_input(self, username):
@@ -25,6 +37,25 @@ class Index:
     def click_confirm(self):
         self.locator.load_element(self.page.confirm_button).click()
 
+    # 登录
+    def login(self, username: str = None, password: str = None):
+        """
+        打开登录页并登录，等待登录后的页面加载完成；用作SessionManager.ensure_session的relogin
+        :param username: 用户名，为空时读取环境变量LOGIN_USERNAME
+        :param password: 密码，为空时读取环境变量LOGIN_PASSWORD
+        """
+        username = username or os.getenv('LOGIN_USERNAME')
+        password = password or os.getenv('LOGIN_PASSWORD')
+        if not username or not password:
+            error_log = '登录失败！未配置登录账号，请在env/se-config.env中设置LOGIN_USERNAME、LOGIN_PASSWORD'
+            LogUtils().errors(error_log)
+            raise Exception(error_log)
+        self.launch_index()
+        self.username_input(username)
+        self.password_input(password)
+        self.click_confirm()
+        self.locator.wait_for_page_load()
+
     # 获取登录提示文本
     def get_login_tip(self):
         return self.locator.load_element(self.page.login_tip).get_text()
@@ -9,12 +9,15 @@ class TestHomePage:
     首页模块测试
     """
 
-    def setup_class(self):
-        self.home_page = HomePage()
+    @pytest.fixture(scope="class", autouse=True)
+    def home_page_driver(self, request, pool_driver):
+        # 使用驱动池租借的驱动，测试类结束后归还
+        request.cls.home_page = HomePage(pool_driver)
 
     def setup_method(self, method):
         self.home_page.go_main()
 
+    @pytest.mark.preflight('home_page.yaml', 'frame', 'map_layer.first_layer', frame='frame')
     def test_switch_layer(self, data):
         """
         切换图层
@@ -23,6 +26,7 @@ class TestHomePage:
         result = self.home_page.get_current_layer()
         Asserts.asserts(data['layer'], result, 'equal')
 
+    @pytest.mark.preflight('home_page.yaml', 'frame', 'track_mode.history', frame='frame')
     def test_view_history_track(self):
         """
         查看历史轨迹
@@ -30,6 +34,7 @@ class TestHomePage:
         self.home_page.view_history_track('hy', '出区')
         Asserts.asserts(self.home_page.is_device_video_opened(), True, 'equal')
 
+    @pytest.mark.preflight('home_page.yaml', 'frame', 'track_mode.real_time', frame='frame')
     def test_real_track(self):
         """
         实时跟踪
@@ -37,6 +42,7 @@ class TestHomePage:
         self.home_page.real_track('hy')
         Asserts.asserts(self.home_page.get_track_status(), '正在跟踪', 'in')
 
+    @pytest.mark.preflight('home_page.yaml', 'frame', 'track_mode.device_list', frame='frame')
     def test_view_device(self):
         """
         查看设备